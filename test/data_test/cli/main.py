@@ -3,19 +3,36 @@ Main CLI application for running integration test stories.
 
 This script uses Typer to create a command-line interface that allows
 users to discover and execute different test "stories" in a modular way.
+
+Only Typer, Rich and the settings are imported with the CLI. The HTTP
+clients, the runner, the data generator and the benchmarks are imported by
+the commands that use them, so 'list-stories' and '--help' start fast
+(see 'bench startup').
 """
 import importlib
 import logging
+import threading
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.table import Table
+
+from data_test.core.config import (
+    BASE_DIR,
+    DATA_POOL_SIZE,
+    KEYCLOAK_ADMIN_POOL_SIZE,
+    STARTUP_BUDGET_MS,
+    USER_POOL_FILE,
+    setup_logging,
+)
 
-from data_test.core.config import setup_logging
+if TYPE_CHECKING:
+    from data_test.core.runner import RunSummary
 
 # --- Typer App Initialization ---
 app = typer.Typer(
@@ -23,6 +40,12 @@ app = typer.Typer(
     help="A CLI for running modular integration test stories against the ComandaLivre API.",
     add_completion=False
 )
+users_app = typer.Typer(help="Manage the pool of pre-provisioned Keycloak test users.")
+app.add_typer(users_app, name="users")
+bench_app = typer.Typer(help="Benchmark the load generator itself.")
+app.add_typer(bench_app, name="bench")
+dataset_app = typer.Typer(help="Generate synthetic datasets for bulk seeding.")
+app.add_typer(dataset_app, name="dataset")
 console = Console()
 
 # --- Story Discovery ---
@@ -35,6 +58,195 @@ def get_available_stories() -> List[str]:
     ]
     return stories
 
+def _print_run_summary(summary: "RunSummary"):
+    """Prints the totals of a concurrent run."""
+    table = Table(title="Run Summary")
+    table.add_column("Started", justify="right")
+    table.add_column("Completed", justify="right", style="green")
+    table.add_column("Failed", justify="right", style="red")
+    table.add_column("Elapsed (s)", justify="right")
+    table.add_column("Iterations/s", justify="right", style="cyan")
+    table.add_row(
+        str(summary.started),
+        str(summary.completed),
+        str(summary.failed),
+        f"{summary.elapsed:.2f}",
+        f"{summary.iterations_per_second:.2f}",
+    )
+    console.print(table)
+    if summary.scheduled:
+        console.print(
+            f"[bold]Arrivals:[/bold] {summary.scheduled} scheduled, "
+            f"[red]{summary.queued} queued[/red] behind the in-flight limit, "
+            f"[red]{summary.dropped} dropped[/red] with the queue full, "
+            f"[yellow]{summary.late} late[/yellow] (max start lag {summary.max_start_lag * 1000:.1f} ms); "
+            "late arrivals are measured from their scheduled start in the corrected latency, "
+            "dropped ones until the end of the run."
+        )
+
+def _print_token_cache_stats():
+    """Prints the Keycloak token cache counters, if the story used the cache."""
+    from data_test.core.token_cache import token_cache
+
+    stats = token_cache.stats()
+    if not (stats["hits"] or stats["misses"] or stats["refreshes"]):
+        return
+    console.print(
+        f"[bold]Token cache:[/bold] {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['refreshes']} refreshes ({stats['hit_ratio']:.1%} hit ratio, {stats['users']} users)"
+    )
+
+def _print_reference_cache_stats():
+    """Prints the reference-data cache counters, if it was used."""
+    from data_test.core.reference_cache import reference_cache
+
+    stats = reference_cache.stats()
+    if not (stats["hits"] or stats["misses"]):
+        return
+    console.print(
+        f"[bold]Reference cache:[/bold] {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_ratio']:.1%} hit ratio, {stats['entries']} entries)"
+    )
+
+def _print_pool_stats():
+    """Prints the connection pool counters of the shared blocking client, if it sent requests."""
+    from data_test.core.api_client import api_client
+
+    stats = api_client.pool_stats()
+    if not stats or not stats["requests"]:
+        return
+    console.print(
+        f"[bold]HTTP pool:[/bold] {stats['new_connections']} new, {stats['reused_connections']} reused "
+        f"({stats['reuse_ratio']:.1%} reuse), {stats['pool_waits']} pool waits "
+        f"({stats['wait_seconds'] * 1000:.1f} ms waiting), {stats['discarded']} discarded"
+    )
+
+def _print_hedging_stats():
+    """Prints the hedging counters, if hedging was enabled."""
+    from data_test.core.api_client import api_client
+
+    if api_client.hedging is None:
+        return
+    stats = api_client.hedging.stats()
+    console.print(
+        f"[bold]Hedging (p{api_client.hedging.percentile:g}):[/bold] {stats['hedges_sent']} hedges sent for "
+        f"{stats['requests']} reads ({stats['overhead']:.1%} extra requests), "
+        f"{stats['hedges_won']} won ({stats['win_ratio']:.1%})"
+    )
+
+def _print_metrics(title: str = "Endpoint Latency (ms)", corrected: bool = False):
+    """
+    Prints the per-route latency percentiles and status codes recorded so far.
+
+    With `corrected`, the latencies are measured from the intended start
+    time of each request (coordinated-omission corrected).
+    """
+    from data_test.core.metrics import metrics
+
+    rows = metrics.snapshot()
+    if not rows:
+        return
+    table = Table(title=title)
+    table.add_column("Route", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Count", justify="right")
+    for column in ("Mean", "p50", "p90", "p99", "Max"):
+        table.add_column(column, justify="right")
+    table.add_column("Status Codes", justify="left")
+    for row in rows:
+        latency = row["corrected"] if corrected else row
+        statuses = ", ".join(f"{code}: {count}" for code, count in row["status_codes"].items())
+        if row["errors"]:
+            statuses = f"{statuses}, [red]errors: {row['errors']}[/red]" if statuses else f"[red]errors: {row['errors']}[/red]"
+        table.add_row(
+            row["route"],
+            str(row["count"]),
+            *(f"{latency[key] * 1000:.1f}" for key in ("mean", "p50", "p90", "p99", "max")),
+            statuses,
+        )
+    console.print(table)
+
+def _print_phase_timing():
+    """Prints, per route, the p50/p99 of each request phase and the mean Server-Timing durations."""
+    from data_test.core.metrics import metrics
+
+    rows = [row for row in metrics.snapshot() if row["phases"]]
+    if not rows:
+        return
+    table = Table(title="Request Phases (ms, p50/p99)")
+    table.add_column("Route", justify="left", style="cyan", no_wrap=True)
+    for column in ("DNS", "Connect", "TLS", "TTFB", "Body"):
+        table.add_column(column, justify="right")
+    table.add_column("Server-Timing (mean)", justify="left")
+    for row in rows:
+        phases = row["phases"]
+        cells = []
+        for phase in ("dns", "connect", "tls", "ttfb", "body"):
+            summary = phases.get(phase)
+            cells.append(f"{summary['p50'] * 1000:.1f}/{summary['p99'] * 1000:.1f}" if summary else "-")
+        server = ", ".join(
+            f"{phase[len('server.'):]} {summary['mean'] * 1000:.1f}"
+            for phase, summary in phases.items() if phase.startswith("server.")
+        )
+        table.add_row(row["route"], *cells, server or "-")
+    console.print(table)
+
+def _print_conditional_gets():
+    """Prints, per route, how many conditional GETs got 304 and the body bytes saved."""
+    from data_test.core.conditional import validator_cache
+
+    rows = validator_cache.snapshot()
+    if not rows:
+        return
+    table = Table(title="Conditional GETs")
+    table.add_column("Route", justify="left", style="cyan", no_wrap=True)
+    table.add_column("GETs", justify="right")
+    table.add_column("Conditional", justify="right")
+    table.add_column("304", justify="right", style="green")
+    table.add_column("304 Ratio", justify="right")
+    table.add_column("KiB Received", justify="right")
+    table.add_column("KiB Saved", justify="right", style="green")
+    for row in rows:
+        table.add_row(
+            row["route"],
+            str(row["requests"]),
+            str(row["conditional"]),
+            str(row["not_modified"]),
+            f"{row['not_modified_ratio']:.1%}",
+            f"{row['bytes_received'] / 1024:.1f}",
+            f"{row['bytes_saved'] / 1024:.1f}",
+        )
+    console.print(table)
+
+def _print_resilience():
+    """Prints retries, short-circuited requests and circuit states of the routes that had any."""
+    from data_test.core.metrics import metrics
+
+    rows = [
+        row for row in metrics.snapshot()
+        if row["retries"] or row["short_circuited"] or row["circuit_state"] != "closed"
+    ]
+    if not rows:
+        return
+    table = Table(title="Retries and Circuit Breakers")
+    table.add_column("Route", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Retries", justify="right")
+    table.add_column("Short-circuited", justify="right", style="red")
+    table.add_column("Circuit", justify="left")
+    for row in rows:
+        table.add_row(row["route"], str(row["retries"]), str(row["short_circuited"]), row["circuit_state"])
+    console.print(table)
+
+def _start_metrics_reporter(interval: float) -> threading.Event:
+    """Prints the latency table every `interval` seconds until the returned event is set."""
+    stop = threading.Event()
+
+    def report():
+        while not stop.wait(interval):
+            _print_metrics("Endpoint Latency (ms, live)")
+
+    threading.Thread(target=report, name="metrics-reporter", daemon=True).start()
+    return stop
+
 # --- CLI Commands ---
 
 @app.command()
@@ -47,10 +259,91 @@ def run(
     iterations: int = typer.Option(1, "--iterations", "-i", help="Number of times to run the story."),
     loop: bool = typer.Option(False, "--loop", "-l", help="Run the story in an infinite loop."),
     delay: float = typer.Option(1.0, "--delay", "-d", help="Delay in seconds between loop iterations."),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1,
+        help="Number of virtual users running the story concurrently as coroutines.",
+    ),
+    metrics_interval: float = typer.Option(
+        0.0, "--metrics-interval", min=0.0,
+        help="Print the endpoint latency table every N seconds while running (0 disables).",
+    ),
+    rate: float = typer.Option(
+        0.0, "--rate", "-r", min=0.0,
+        help="Open-loop mode: start this many iterations per second, regardless of how long they take (0 disables).",
+    ),
+    duration: float = typer.Option(60.0, "--duration", min=0.0, help="Duration in seconds of an open-loop (--rate) run."),
+    max_in_flight: int = typer.Option(
+        100, "--max-in-flight", min=1,
+        help="Open-loop mode: maximum iterations running at once; further arrivals wait for a free slot.",
+    ),
+    max_queued: int = typer.Option(
+        100, "--max-queued", min=0,
+        help="Open-loop mode: maximum arrivals waiting for a slot; further arrivals are dropped and counted.",
+    ),
+    arrival_curve: str = typer.Option(
+        "flat", "--arrival-curve",
+        help="Open-loop mode: time-of-day arrival curve (flat, restaurant, or one registered with register_arrival_curve); --rate is its peak rate.",
+    ),
+    day_length: float = typer.Option(
+        86400.0, "--day-length", min=1.0,
+        help="Open-loop mode: seconds one simulated day of the arrival curve lasts.",
+    ),
+    start_hour: float = typer.Option(
+        0.0, "--start-hour", min=0.0, max=23.99, help="Open-loop mode: simulated hour at which the run starts.",
+    ),
+    product_skew: Optional[float] = typer.Option(
+        None, "--product-skew", min=0.0,
+        help="Zipf exponent of product popularity in orders (0 picks uniformly; default PRODUCT_ZIPF_EXPONENT).",
+    ),
+    order_size: Optional[str] = typer.Option(
+        None, "--order-size",
+        help="Distribution of items per order (single, restaurant, or one registered with register_order_sizes; default ORDER_SIZE_DISTRIBUTION).",
+    ),
+    no_reference_cache: bool = typer.Option(
+        False, "--no-reference-cache",
+        help="Always fetch reference data (categories, role and company types) from the API.",
+    ),
+    conditional_get: bool = typer.Option(
+        False, "--conditional-get",
+        help="Send GETs with If-None-Match/If-Modified-Since when validators are known and report the bytes saved.",
+    ),
+    seed: Optional[int] = typer.Option(
+        None, "--seed",
+        help="Seed the generated data: each iteration gets its own stream derived from it, so a run can be replayed. Not compatible with data pools.",
+    ),
+    process_index: int = typer.Option(
+        0, "--process-index", min=0,
+        help="Index of this process when several processes run with the same --seed; keeps their data unique.",
+    ),
+    data_pool: bool = typer.Option(
+        False, "--data-pool",
+        help=(
+            "Serve fake names, dishes, sentences, phones and CNPJs from pre-generated pools instead of calling Faker per payload. "
+            "Not compatible with --seed: every iteration draws from the same pools, so its data would depend on scheduling."
+        ),
+    ),
+    phase_timing: bool = typer.Option(
+        False, "--phase-timing",
+        help="Break requests down into DNS, connect, TLS, TTFB and body, and record Server-Timing.",
+    ),
+    hedge_percentile: float = typer.Option(
+        0.0, "--hedge-percentile", min=0.0, max=99.99,
+        help="Duplicate GET requests still unanswered at this route latency percentile (0 disables).",
+    ),
 ):
     """
     Discover and run a specific test story.
     """
+    import asyncio
+
+    from data_test.core.api_client import api_client
+    from data_test.core.conditional import validator_cache
+    from data_test.core.data_generator import data_generator
+    from data_test.core.distributions import ARRIVAL_CURVES, ORDER_SIZES, ZipfPopularity
+    from data_test.core.hedging import HedgingPolicy
+    from data_test.core.reference_cache import reference_cache
+    from data_test.core.runner import run_concurrent, run_open_loop
+
     setup_logging()
     console.print(Panel("[bold green]ComandaLivre - Integration Test CLI[/bold green]", expand=False))
 
@@ -81,15 +374,68 @@ def run(
         console.print(f"[bold red]Error:[/] Could not import story module '{story_name}'.")
         raise typer.Exit(code=1)
 
+    if no_reference_cache:
+        reference_cache.enabled = False
+    if conditional_get:
+        validator_cache.enabled = True
+    if phase_timing:
+        api_client.phase_timing = True
+    if seed is not None and (data_pool or data_generator.pools is not None):
+        console.print(
+            "[bold red]Error:[/] --seed cannot be combined with data pools (--data-pool or DATA_POOL_ENABLED): "
+            "every iteration draws from the same pools, so the data an iteration gets would depend on scheduling."
+        )
+        raise typer.Exit(code=1)
+    if data_pool and data_generator.pools is None:
+        data_generator.use_pools()
+    if seed is not None:
+        data_generator.set_seed(seed, process_index)
+    if arrival_curve not in ARRIVAL_CURVES:
+        console.print(f"[bold red]Error:[/] Unknown arrival curve '{arrival_curve}'; use one of {', '.join(ARRIVAL_CURVES)}.")
+        raise typer.Exit(code=1)
+    if order_size is not None:
+        if order_size not in ORDER_SIZES:
+            console.print(f"[bold red]Error:[/] Unknown order size '{order_size}'; use one of {', '.join(ORDER_SIZES)}.")
+            raise typer.Exit(code=1)
+        data_generator.default.order_sizes = ORDER_SIZES[order_size]
+    if product_skew is not None:
+        data_generator.default.product_popularity = ZipfPopularity(product_skew)
+    if hedge_percentile > 0:
+        api_client.hedging = HedgingPolicy(hedge_percentile)
+
     # --- Execution Loop ---
-    if loop:
+    stop_reporter = _start_metrics_reporter(metrics_interval) if metrics_interval > 0 else None
+    if rate > 0:
+        shape = "" if arrival_curve == "flat" else f" at peak, following the '{arrival_curve}' curve from {start_hour:g}h,"
+        console.print(
+            f"\n[bold]Running story '{story_name}' at {rate:g} iteration(s)/s{shape} for {duration:g}s "
+            f"(at most {max_in_flight} in flight, {max_queued} queued).[/bold]"
+        )
+        summary = asyncio.run(run_open_loop(
+            story_module, rate, duration, max_in_flight,
+            ARRIVAL_CURVES[arrival_curve], day_length, start_hour, max_queued=max_queued,
+            hedging=api_client.hedging, phase_timing=phase_timing,
+        ))
+        _print_run_summary(summary)
+    elif concurrency > 1:
+        target = "until Ctrl+C" if loop else f"for {iterations} iteration(s)"
+        console.print(
+            f"\n[bold]Running story '{story_name}' with {concurrency} virtual users {target}.[/bold]"
+        )
+        summary = asyncio.run(run_concurrent(
+            story_module, concurrency, None if loop else iterations,
+            hedging=api_client.hedging, phase_timing=phase_timing,
+        ))
+        _print_run_summary(summary)
+    elif loop:
         console.print(f"\n[bold]Running story '{story_name}' in a loop. Press Ctrl+C to stop.[/bold]")
         run_count = 0
         while True:
             try:
                 run_count += 1
                 console.print(f"\n--- [blue]Loop Iteration: {run_count}[/blue] ---")
-                story_module.run_story()
+                with data_generator.stream(f"i{run_count - 1}"):
+                    story_module.run_story()
                 time.sleep(delay)
             except KeyboardInterrupt:
                 console.print("\n[yellow]Loop stopped by user.[/yellow]")
@@ -98,8 +444,21 @@ def run(
         console.print(f"\n[bold]Running story '{story_name}' for {iterations} iteration(s).[/bold]")
         for i in range(iterations):
             console.print(f"\n--- [blue]Iteration: {i + 1} of {iterations}[/blue] ---")
-            story_module.run_story()
+            with data_generator.stream(f"i{i}"):
+                story_module.run_story()
 
+    if stop_reporter:
+        stop_reporter.set()
+    _print_metrics("Endpoint Latency, raw (ms)" if rate > 0 else "Endpoint Latency (ms)")
+    if rate > 0:
+        _print_metrics("Endpoint Latency, from intended start (ms)", corrected=True)
+    _print_phase_timing()
+    _print_conditional_gets()
+    _print_resilience()
+    _print_token_cache_stats()
+    _print_reference_cache_stats()
+    _print_pool_stats()
+    _print_hedging_stats()
     console.print(f"\n[bold green]Finished running story '{story_name}'.[/bold green]")
 
 
@@ -117,5 +476,257 @@ def list_stories():
         console.print(f"  - [cyan]{story}[/cyan]")
 
 
+@users_app.command("provision")
+def provision_users(
+    count: int = typer.Option(..., "--count", "-n", min=1, help="Number of users to create for each role (owner and waiter)."),
+    workers: int = typer.Option(
+        KEYCLOAK_ADMIN_POOL_SIZE, "--workers", "-w", min=1,
+        help="Number of users created concurrently.",
+    ),
+):
+    """
+    Create owner and waiter users in Keycloak and store their credentials in the user pool.
+    """
+    from data_test.core.data_generator import data_generator, split_name
+    from data_test.core.keycloak_admin import keycloak_admin
+    from data_test.core.user_pool import ROLES, user_pool
+
+    setup_logging()
+    credentials = [data_generator.generate_pool_user(role) for role in ROLES for _ in range(count)]
+    console.print(f"[bold]Provisioning {len(credentials)} Keycloak users with {workers} workers...[/bold]")
+
+    start = time.monotonic()
+    user_ids = keycloak_admin.provision_users(
+        (
+            {
+                "username": item["username"],
+                "email": item["email"],
+                "password": item["password"],
+                **split_name(item["name"]),
+            }
+            for item in credentials
+        ),
+        workers=workers,
+    )
+    elapsed = time.monotonic() - start
+
+    created = [item for item, user_id in zip(credentials, user_ids) if user_id]
+    user_pool.append(created)
+    failed = len(credentials) - len(created)
+    console.print(
+        f"[bold green]{len(created)} users provisioned[/bold green] in {elapsed:.2f}s "
+        f"([red]{failed} failed[/red]). Pool file: {user_pool.path}"
+    )
+    console.print(f"Free users per role: {user_pool.sizes()}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@users_app.command("realm-import")
+def generate_realm_import(
+    count: int = typer.Option(..., "--count", "-n", min=1, help="Number of users to generate for each role (owner and waiter)."),
+    output: Path = typer.Option(
+        BASE_DIR.parent / "data" / "realm-users.json", "--output", "-o",
+        help="Keycloak partial-import file to write.",
+    ),
+    pool_file: Path = typer.Option(USER_POOL_FILE, "--pool-file", help="User pool file to write (replaced)."),
+    shared_password: Optional[str] = typer.Option(
+        None, "--shared-password",
+        help="Give every user this password, pre-hashed once, for a much faster import.",
+    ),
+    hash_iterations: int = typer.Option(27500, "--hash-iterations", min=1, help="PBKDF2 iterations of the pre-hashed password (below Keycloak's 210000 default; rehashed on first login)."),
+):
+    """
+    Generate a Keycloak partial-import file with mass test users, plus the matching user pool.
+    """
+    from data_test.core.realm_import import write_realm_import
+
+    start = time.monotonic()
+    written = write_realm_import(count, output, pool_file, shared_password, hash_iterations)
+    console.print(
+        f"[bold green]{written} users written[/bold green] in {time.monotonic() - start:.2f}s.\n"
+        f"  Realm import: {output}\n"
+        f"  User pool:    {pool_file}\n"
+        "Import it in Keycloak under Realm settings > Action > Partial import (realm 'comandalivre')."
+    )
+
+
+@dataset_app.command("generate")
+def generate_dataset(
+    output: Path = typer.Option(
+        BASE_DIR.parent / "data" / "dataset", "--output", "-o",
+        help="Directory to write the entity shards and manifest.json to.",
+    ),
+    companies: int = typer.Option(1000, "--companies", "-n", min=1, help="Number of companies."),
+    waiters: int = typer.Option(3, "--waiters-per-company", min=0, help="Waiters per company (plus one owner)."),
+    products: int = typer.Option(20, "--products-per-company", min=0, help="Products per company."),
+    tables: int = typer.Option(10, "--tables-per-company", min=0, help="Tables per company."),
+    commands: int = typer.Option(5, "--commands-per-table", min=0, help="Commands per table."),
+    orders: int = typer.Option(3, "--orders-per-command", min=0, help="Orders per command."),
+    items: int = typer.Option(3, "--items-per-order", min=1, help="Distinct products per order (at most the products per company)."),
+    product_skew: Optional[float] = typer.Option(
+        None, "--product-skew", min=0.0,
+        help="Zipf exponent of product popularity in orders (0 picks uniformly; default PRODUCT_ZIPF_EXPONENT).",
+    ),
+    fmt: str = typer.Option("jsonl", "--format", "-f", help="Output format: jsonl or csv."),
+    shard_size: int = typer.Option(100_000, "--shard-size", min=1, help="Rows per shard file."),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed for a reproducible dataset."),
+):
+    """
+    Write a synthetic restaurant world to sharded JSONL or CSV files, with constant memory.
+
+    Companies, employees, products, tables, commands, orders and order items
+    reference each other by UUID, so the files can be bulk-loaded into a
+    database in dependency order (see manifest.json).
+    """
+    from data_test.core.dataset import FORMATS, DatasetShape, write_dataset
+
+    if fmt not in FORMATS:
+        console.print(f"[bold red]Error:[/] Unknown format '{fmt}'; use {' or '.join(FORMATS)}.")
+        raise typer.Exit(code=1)
+    shape = DatasetShape(
+        companies=companies,
+        waiters_per_company=waiters,
+        products_per_company=products,
+        tables_per_company=tables,
+        commands_per_table=commands,
+        orders_per_command=orders,
+        items_per_order=items,
+    )
+    start = time.monotonic()
+    counts = write_dataset(output, shape, fmt, shard_size, seed, product_skew)
+    elapsed = time.monotonic() - start
+
+    table = Table(title=f"Dataset written to {output}")
+    table.add_column("Entity", justify="left", style="cyan")
+    table.add_column("Rows", justify="right")
+    for entity, rows in counts.items():
+        table.add_row(entity, f"{rows:,}")
+    console.print(table)
+    total = sum(counts.values())
+    console.print(f"[bold green]{total:,} rows[/bold green] in {elapsed:.2f}s ({total / elapsed if elapsed > 0 else 0:,.0f} rows/s).")
+
+
+@bench_app.command("http2")
+def bench_http2(
+    rate: float = typer.Option(200.0, "--rate", "-r", min=0.1, help="Requests per second sent by each transport."),
+    duration: float = typer.Option(10.0, "--duration", min=0.1, help="Duration in seconds of each run."),
+    workers: int = typer.Option(64, "--workers", "-w", min=1, help="Threads sending requests concurrently."),
+):
+    """
+    Compare HTTP/1.1 and HTTP/2 at the same request rate.
+
+    Sends GET company/companies with each transport and reports the
+    connections opened, the CPU used by this process and the p50/p99 latency.
+    """
+    from data_test.core.bench import benchmark_transport
+
+    setup_logging()
+    table = Table(title=f"Transport Benchmark ({rate:g} req/s for {duration:g}s)")
+    table.add_column("Transport", justify="left", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Connections", justify="right")
+    table.add_column("CPU (%)", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    for http2 in (False, True):
+        result = benchmark_transport(http2, rate, duration, workers)
+        if http2 and result.transport != "HTTP/2":
+            console.print("[bold yellow]HTTP/2 is not available; install the 'http2' extra to compare.[/bold yellow]")
+            break
+        table.add_row(
+            result.transport,
+            str(result.requests),
+            str(result.errors),
+            str(result.connections),
+            f"{result.cpu_percent:.1f}",
+            f"{result.p50 * 1000:.1f}",
+            f"{result.p99 * 1000:.1f}",
+        )
+    console.print(table)
+
+
+
+@bench_app.command("datagen")
+def bench_datagen(
+    rounds: int = typer.Option(2000, "--rounds", "-n", min=1, help="Payload mixes built by each mode."),
+    pool_size: int = typer.Option(DATA_POOL_SIZE, "--pool-size", min=1, help="Values per pool in pooled mode."),
+):
+    """
+    Compare direct and pooled fake data generation.
+
+    Builds the same payload mix (user, company, product, table, command and
+    order) with Faker calls per payload and from pre-generated pools, and
+    reports the CPU time per payload.
+    """
+    from data_test.core.bench import benchmark_datagen
+
+    setup_logging()
+    table = Table(title=f"Data Generation Benchmark ({rounds} rounds)")
+    table.add_column("Mode", justify="left", style="cyan")
+    table.add_column("Payloads", justify="right")
+    table.add_column("Pool fill (s)", justify="right")
+    table.add_column("CPU (s)", justify="right")
+    table.add_column("µs/payload", justify="right")
+    table.add_column("Payloads/s", justify="right")
+    for pooled in (False, True):
+        result = benchmark_datagen(pooled, rounds, pool_size)
+        table.add_row(
+            result.mode,
+            str(result.payloads),
+            f"{result.fill_seconds:.2f}" if pooled else "-",
+            f"{result.cpu_seconds:.2f}",
+            f"{result.microseconds_per_payload:.1f}",
+            f"{result.payloads_per_second:,.0f}",
+        )
+    console.print(table)
+
+
+@bench_app.command("startup")
+def bench_startup(
+    runs: int = typer.Option(5, "--runs", "-n", min=1, help="Fresh interpreters to start."),
+    budget_ms: float = typer.Option(
+        STARTUP_BUDGET_MS, "--budget-ms", min=1.0,
+        help="Maximum median cold-start time of 'list-stories', in milliseconds.",
+    ),
+):
+    """
+    Guard the CLI cold-start path.
+
+    Runs 'list-stories' in fresh interpreters with `-X importtime` and fails
+    (exit code 1) when the median start time exceeds the budget or when a
+    module that should only load on demand (Faker, PyJWT, NumPy, the HTTP
+    clients) was imported.
+    """
+    from data_test.core.bench import DEFERRED_MODULES, benchmark_startup
+
+    result = benchmark_startup(runs)
+    table = Table(title=f"Slowest Imports (self time, {runs} run(s))")
+    table.add_column("Module", justify="left", style="cyan")
+    table.add_column("Self (ms)", justify="right")
+    for module, seconds in result.slowest_imports:
+        table.add_row(module, f"{seconds * 1000:.1f}")
+    console.print(table)
+    console.print(
+        f"[bold]Cold start:[/bold] {result.wall_seconds * 1000:.0f} ms median "
+        f"(budget {budget_ms:g} ms); importing the CLI took {result.import_seconds * 1000:.0f} ms."
+    )
+
+    failed = False
+    if result.wall_seconds * 1000 > budget_ms:
+        console.print("[bold red]Cold start is over budget.[/bold red]")
+        failed = True
+    if result.eager_modules:
+        console.print(
+            f"[bold red]Imported at startup but should load on demand:[/bold red] {', '.join(result.eager_modules)} "
+            f"(deferred: {', '.join(DEFERRED_MODULES)})"
+        )
+        failed = True
+    if failed:
+        raise typer.Exit(code=1)
+    console.print("[bold green]Startup within budget.[/bold green]")
+
+
 if __name__ == "__main__":
     app()
@@ -5,249 +5,506 @@ This module provides a client class to handle HTTP requests, authentication,
 and responses from the API, abstracting the details of the HTTP calls
 from the main test logic.
 """
+import asyncio
 import logging
-import re
+import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
 
+import httpx
 import requests
-from requests import Response, Session
 
 from data_test.core.config import (
     API_BASE_URL,
-    KEYCLOAK_BASE_URL,
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP2_ENABLED,
+    PHASE_TIMING_ENABLED,
+    KEYCLOAK_REALM,
     KEYCLOAK_TOKEN_ENDPOINT,
     KEYCLOAK_CLIENT_ID,
     KEYCLOAK_CLIENT_SECRET,
-    KEYCLOAK_ADMIN_CLIENT_ID,
-    KEYCLOAK_ADMIN_PASSWORD,
-    KEYCLOAK_ADMIN_TOKEN_ENDPOINT,
-    KEYCLOAK_ADMIN_USERNAME,
+    PAGINATION_PAGE_SIZE,
     TEST_USER_USERNAME,
     TEST_USER_PASSWORD
 )
+from data_test.core import routes
+from data_test.core.conditional import validator_cache
+from data_test.core.hedging import HedgingPolicy
+from data_test.core.http_pool import (
+    HttpSession,
+    connection_phases,
+    create_http2_client,
+    create_session,
+    phase_trace,
+    session_pool_stats,
+)
+from data_test.core.keycloak_admin import keycloak_admin
+from data_test.core.lazy import LazySingleton
+from data_test.core.metrics import metrics, parse_server_timing, route_template, schedule_lag
+from data_test.core.pagination import aiter_items, iter_items
+from data_test.core.reference_cache import reference_cache
+from data_test.core.resilience import CircuitBreaker, circuit_breakers, is_failure, retry_policy
+from data_test.core.response import ApiResponse
+from data_test.core.routes import Route
 
 
-class ApiClient:
-    """
-    A client to interact with the application's REST API.
+def build_headers(token: Optional[str]) -> Dict[str, str]:
+    """Builds the request headers of one identity (actor)."""
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+class BaseApiClient:
     """
+    Endpoint helpers shared by the blocking and the asyncio clients.
 
-    def __init__(self):
-        """Initializes a requests session and the auth token."""
-        self.session: Session = requests.Session()
-        self.token: Optional[str] = None
-        self.session.headers.update({"Content-Type": "application/json"})
-
-    def _update_auth_header(self):
-        """Updates the session headers with the Bearer token."""
-        if self.token:
-            self.session.headers.update({"Authorization": f"Bearer {self.token}"})
-        else:
-            self.session.headers.pop("Authorization", None)
-            logging.warning("No auth token set. Making unauthenticated request.")
+    Subclasses only have to provide `_make_request`; every endpoint method
+    returns whatever it returns, so on `AsyncApiClient` they are awaitable.
+    """
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Response]:
+    def _make_request(
+        self, method: str, endpoint: str, route: Optional[Route] = None, **kwargs
+    ) -> Optional[ApiResponse]:
+        """Sends a single request. Implemented by the concrete clients."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _metric_key(method: str, endpoint: str, route: Optional[Route]) -> str:
+        """Returns the 'METHOD route/template' key a request is recorded under."""
+        if route is not None:
+            return route.key
+        # Ad-hoc calls through the generic helpers have no declared route.
+        path = endpoint[len(API_BASE_URL) + 1:] if endpoint.startswith(API_BASE_URL) else endpoint
+        return f"{method} {route_template(path)}"
+
+    @staticmethod
+    def _record(key: str, start: float, response, phases: Optional[Dict[str, float]] = None) -> None:
         """
-        A generic request maker to handle exceptions and logging.
-        """
-        try:
-            # Ensure session headers are up-to-date for every request
-            current_headers = self.session.headers.copy()
-            if 'headers' in kwargs:
-                current_headers.update(kwargs.pop('headers'))
+        Records the latency and status of one attempt under its route template.
 
-            response = self.session.request(method, endpoint, timeout=15, headers=current_headers, **kwargs)
-            return response
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Request to {endpoint} failed: {e}")
+        The corrected latency adds the schedule lag of the current iteration,
+        so it is measured from when the request should have been sent.
+        """
+        elapsed = time.perf_counter() - start
+        status_code = response.status_code if response is not None else None
+        metrics.record(key, elapsed, status_code, elapsed + schedule_lag.get(), phases)
+
+    @staticmethod
+    def _admit(key: str) -> Tuple[bool, Optional[CircuitBreaker]]:
+        """Checks the circuit of a route before a request; rejected requests are counted."""
+        breaker = circuit_breakers.get(key)
+        if breaker is not None and not breaker.allow():
+            metrics.count(key, "short_circuited")
+            return False, breaker
+        retry_policy.on_request()
+        return True, breaker
+
+    @staticmethod
+    def _retry_delay(key: str, method: str, attempt: int, response, breaker: Optional[CircuitBreaker]) -> Optional[float]:
+        """Feeds the outcome of an attempt to the circuit and returns the backoff before a retry, if any."""
+        status_code = response.status_code if response is not None else None
+        if breaker is not None:
+            breaker.record(is_failure(status_code))
+        delay = retry_policy.backoff(method, attempt, status_code)
+        if delay is None or (breaker is not None and not breaker.allow()):
             return None
-
-    def set_token(self, token: str):
-        """Manually sets the auth token and updates the session header."""
-        self.token = token
-        self._update_auth_header()
-
-    def get(self, endpoint_path: str, params: Optional[Dict] = None) -> Optional[Response]:
+        metrics.count(key, "retries")
+        return delay
+
+    def _call(self, route: Route, params: Optional[Dict] = None, data: Optional[Any] = None, **path_params):
+        """Sends a request to a registered route, filling its path template with `path_params`."""
+        kwargs: Dict[str, Any] = {}
+        if params is not None:
+            kwargs["params"] = params
+        if data is not None:
+            kwargs["json"] = data
+        return self._make_request(route.method, f"{API_BASE_URL}/{route.path(**path_params)}", route=route, **kwargs)
+
+    def get(self, endpoint_path: str, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Generic GET request helper."""
         return self._make_request("GET", f"{API_BASE_URL}/{endpoint_path}", params=params)
 
-    def post(self, endpoint_path: str, data: Dict) -> Optional[Response]:
+    def post(self, endpoint_path: str, data: Dict) -> Optional[ApiResponse]:
         """Generic POST request helper."""
         return self._make_request("POST", f"{API_BASE_URL}/{endpoint_path}", json=data)
 
-    def patch(self, endpoint_path: str, data: Dict) -> Optional[Response]:
+    def patch(self, endpoint_path: str, data: Dict) -> Optional[ApiResponse]:
         """Generic PATCH request helper."""
         return self._make_request("PATCH", f"{API_BASE_URL}/{endpoint_path}", json=data)
 
-    def put(self, endpoint_path: str, data: Dict) -> Optional[Response]:
+    def put(self, endpoint_path: str, data: Dict) -> Optional[ApiResponse]:
         """Generic PUT request helper."""
         return self._make_request("PUT", f"{API_BASE_URL}/{endpoint_path}", json=data)
 
-    def delete(self, endpoint_path: str) -> Optional[Response]:
+    def delete(self, endpoint_path: str) -> Optional[ApiResponse]:
         """Generic DELETE request helper."""
         return self._make_request("DELETE", f"{API_BASE_URL}/{endpoint_path}")
 
-    def get_public_companies(self, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_public_companies(self, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets public companies, optionally with query parameters."""
-        return self.get("company/companies", params=params)
+        return self._call(routes.GET_PUBLIC_COMPANIES, params=params)
 
-    def get_public_company_by_id(self, company_id: str) -> Optional[Response]:
+    def get_public_company_by_id(self, company_id: str) -> Optional[ApiResponse]:
         """Gets a single public company by its ID."""
-        return self.get(f"company/companies/{company_id}")
+        return self._call(routes.GET_PUBLIC_COMPANY_BY_ID, company_id=company_id)
 
-    def get_public_products(self, company_id: str, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_public_products(self, company_id: str, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets public products for a specific company."""
         if params is None:
             params = {}
         params["companyId"] = company_id
-        return self.get("comandalivre/products", params=params)
+        return self._call(routes.GET_PUBLIC_PRODUCTS, params=params)
 
-    def get_public_product_by_id(self, product_id: str) -> Optional[Response]:
+    def get_public_product_by_id(self, product_id: str) -> Optional[ApiResponse]:
         """Gets a single public product by its ID."""
-        return self.get(f"comandalivre/products/{product_id}")
+        return self._call(routes.GET_PUBLIC_PRODUCT_BY_ID, product_id=product_id)
 
-    def create_company(self, company_data: Dict[str, Any]) -> Optional[Response]:
+    def create_company(self, company_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Creates a new company."""
-        return self.post("company/companies", data=company_data)
+        return self._call(routes.CREATE_COMPANY, data=company_data)
 
-    def get_company_type_by_enum(self, enum_name: str) -> Optional[Response]:
+    def get_company_type_by_enum(self, enum_name: str) -> Optional[ApiResponse]:
         """Gets a company type by its enum name (e.g., RESTAURANT)."""
-        return self.get(f"company/company-types/by-enum/{enum_name}")
+        return self._call(routes.GET_COMPANY_TYPE_BY_ENUM, enum_name=enum_name)
 
-    def get_product_categories(self) -> Optional[Response]:
+    def get_product_categories(self) -> Optional[ApiResponse]:
         """Gets all product categories."""
-        return self.get("comandalivre/product-categories/list")
+        return self._call(routes.GET_PRODUCT_CATEGORIES)
 
-    def create_product(self, product_data: Dict[str, Any]) -> Optional[Response]:
+    def create_product(self, product_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Creates a new product."""
-        return self.post("comandalivre/products", data=product_data)
+        return self._call(routes.CREATE_PRODUCT, data=product_data)
 
-    def update_product(self, product_id: str, product_data: Dict[str, Any]) -> Optional[Response]:
+    def update_product(self, product_id: str, product_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Updates an existing product."""
-        return self.put(f"comandalivre/products/{product_id}", data=product_data)
+        return self._call(routes.UPDATE_PRODUCT, data=product_data, product_id=product_id)
 
-    def update_product_status(self, product_id: str, status: bool) -> Optional[Response]:
+    def update_product_status(self, product_id: str, status: bool) -> Optional[ApiResponse]:
         """Updates the availability status of a product."""
-        return self.patch(f"comandalivre/products/{product_id}/status/{status}", data={})
+        return self._call(routes.UPDATE_PRODUCT_STATUS, data={}, product_id=product_id, status=status)
 
-    def delete_product(self, product_id: str) -> Optional[Response]:
+    def delete_product(self, product_id: str) -> Optional[ApiResponse]:
         """Deletes a product."""
-        return self.delete(f"comandalivre/products/{product_id}")
+        return self._call(routes.DELETE_PRODUCT, product_id=product_id)
 
-    def create_table(self, table_data: Dict[str, Any]) -> Optional[Response]:
+    def create_table(self, table_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Creates a new table."""
-        return self.post("comandalivre/tables", data=table_data)
+        return self._call(routes.CREATE_TABLE, data=table_data)
 
-    def create_tables_bulk(self, bulk_data: Dict[str, Any]) -> Optional[Response]:
+    def create_tables_bulk(self, bulk_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Creates tables in bulk."""
-        return self.post("comandalivre/tables/bulk", data=bulk_data)
+        return self._call(routes.CREATE_TABLES_BULK, data=bulk_data)
 
-    def get_tables(self, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_tables(self, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets tables with pagination."""
-        return self.get("comandalivre/tables", params=params)
+        return self._call(routes.GET_TABLES, params=params)
 
-    def get_tables_list(self, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_tables_list(self, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets the full list of tables."""
-        return self.get("comandalivre/tables/list", params=params)
+        return self._call(routes.GET_TABLES_LIST, params=params)
 
-    def get_table_by_id(self, table_id: str) -> Optional[Response]:
+    def get_table_by_id(self, table_id: str) -> Optional[ApiResponse]:
         """Gets a single table by ID."""
-        return self.get(f"comandalivre/tables/{table_id}")
+        return self._call(routes.GET_TABLE_BY_ID, table_id=table_id)
 
-    def update_table(self, table_id: str, table_data: Dict[str, Any]) -> Optional[Response]:
+    def update_table(self, table_id: str, table_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Updates an existing table."""
-        return self.put(f"comandalivre/tables/{table_id}", data=table_data)
+        return self._call(routes.UPDATE_TABLE, data=table_data, table_id=table_id)
 
-    def delete_table(self, table_id: str) -> Optional[Response]:
+    def delete_table(self, table_id: str) -> Optional[ApiResponse]:
         """Deletes a table."""
-        return self.delete(f"comandalivre/tables/{table_id}")
+        return self._call(routes.DELETE_TABLE, table_id=table_id)
 
-    def get_role_type_by_enum(self, enum_name: str) -> Optional[Response]:
+    def get_role_type_by_enum(self, enum_name: str) -> Optional[ApiResponse]:
         """Gets a role type by its enum name (e.g., WAITER)."""
-        return self.get(f"company/role-types/by-enum/{enum_name}")
+        return self._call(routes.GET_ROLE_TYPE_BY_ENUM, enum_name=enum_name)
 
-    def get_role_types_list(self) -> Optional[Response]:
+    def get_role_types_list(self) -> Optional[ApiResponse]:
         """Gets the list of role types."""
-        return self.get("company/role-types/list")
+        return self._call(routes.GET_ROLE_TYPES_LIST)
 
-    def invite_employee(self, invite_data: Dict[str, Any]) -> Optional[Response]:
+    def invite_employee(self, invite_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Invites a new employee to a company."""
-        return self.post("company/employees/invites", data=invite_data)
+        return self._call(routes.INVITE_EMPLOYEE, data=invite_data)
 
-    def accept_employee_invite(self, invite_id: str) -> Optional[Response]:
+    def accept_employee_invite(self, invite_id: str) -> Optional[ApiResponse]:
         """Accepts an employee invitation."""
-        return self.patch(f"company/employees/invites/{invite_id}/accept", data={})
+        return self._call(routes.ACCEPT_EMPLOYEE_INVITE, data={}, invite_id=invite_id)
 
-    def get_employees_for_company(self, company_id: str) -> Optional[Response]:
+    def get_employees_for_company(self, company_id: str) -> Optional[ApiResponse]:
         """Gets all employees for a given company."""
-        return self.get(f"company/employees/by-company/{company_id}")
+        return self._call(routes.GET_EMPLOYEES_FOR_COMPANY, company_id=company_id)
 
-    def get_employee_invites_by_company(self, company_id: str, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_employee_invites_by_company(self, company_id: str, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets employee invites for a company."""
-        return self.get(f"company/employees/invites/company/{company_id}", params=params)
+        return self._call(routes.GET_EMPLOYEE_INVITES_BY_COMPANY, params=params, company_id=company_id)
 
-    def get_my_employee_invites(self, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_my_employee_invites(self, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets employee invites for the logged-in user."""
-        return self.get("company/employees/invites/", params=params)
+        return self._call(routes.GET_MY_EMPLOYEE_INVITES, params=params)
 
-    def create_command(self, command_data: Dict[str, Any]) -> Optional[Response]:
+    def create_command(self, command_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Creates a new command (comanda)."""
-        return self.post("comandalivre/commands", data=command_data)
+        return self._call(routes.CREATE_COMMAND, data=command_data)
 
-    def get_command_by_id(self, command_id: str) -> Optional[Response]:
+    def get_command_by_id(self, command_id: str) -> Optional[ApiResponse]:
         """Gets a command by ID."""
-        return self.get(f"comandalivre/commands/{command_id}")
+        return self._call(routes.GET_COMMAND_BY_ID, command_id=command_id)
 
-    def update_command_status(self, command_id: str, status_data: Dict[str, Any]) -> Optional[Response]:
+    def update_command_status(self, command_id: str, status_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Updates the status of a command."""
-        return self.patch(f"comandalivre/commands/{command_id}/status", data=status_data)
+        return self._call(routes.UPDATE_COMMAND_STATUS, data=status_data, command_id=command_id)
 
-    def change_command_table(self, command_id: str, change_data: Dict[str, Any]) -> Optional[Response]:
+    def change_command_table(self, command_id: str, change_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Changes the table for a command."""
-        return self.patch(f"comandalivre/commands/{command_id}/change-table", data=change_data)
+        return self._call(routes.CHANGE_COMMAND_TABLE, data=change_data, command_id=command_id)
 
-    def get_commands_count(self) -> Optional[Response]:
+    def get_commands_count(self) -> Optional[ApiResponse]:
         """Gets the count of commands."""
-        return self.get("comandalivre/commands/count")
+        return self._call(routes.GET_COMMANDS_COUNT)
 
-    def get_command_bill_data(self, command_id: str) -> Optional[Response]:
+    def get_command_bill_data(self, command_id: str) -> Optional[ApiResponse]:
         """Gets bill data for a command."""
-        return self.get(f"comandalivre/commands/{command_id}/bill-data")
+        return self._call(routes.GET_COMMAND_BILL_DATA, command_id=command_id)
 
-    def add_order_to_command(self, order_data: Dict[str, Any]) -> Optional[Response]:
+    def add_order_to_command(self, order_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Adds items as an order to a command."""
-        return self.post("comandalivre/orders", data=order_data)
+        return self._call(routes.ADD_ORDER_TO_COMMAND, data=order_data)
 
-    def get_orders(self, params: Optional[Dict] = None) -> Optional[Response]:
+    def get_orders(self, params: Optional[Dict] = None) -> Optional[ApiResponse]:
         """Gets orders with optional query parameters."""
-        return self.get("comandalivre/orders", params=params)
+        return self._call(routes.GET_ORDERS, params=params)
 
-    def get_order_by_id(self, order_id: str) -> Optional[Response]:
+    def get_order_by_id(self, order_id: str) -> Optional[ApiResponse]:
         """Gets a single order by ID."""
-        return self.get(f"comandalivre/orders/{order_id}")
+        return self._call(routes.GET_ORDER_BY_ID, order_id=order_id)
 
-    def update_order_status(self, order_id: str, status_data: Dict[str, Any]) -> Optional[Response]:
+    def update_order_status(self, order_id: str, status_data: Dict[str, Any]) -> Optional[ApiResponse]:
         """Updates the status of an order."""
-        return self.patch(f"comandalivre/orders/{order_id}/status", data=status_data)
+        return self._call(routes.UPDATE_ORDER_STATUS, data=status_data, order_id=order_id)
 
-    def delete_order(self, order_id: str) -> Optional[Response]:
+    def delete_order(self, order_id: str) -> Optional[ApiResponse]:
         """Deletes an order."""
-        return self.delete(f"comandalivre/orders/{order_id}")
+        return self._call(routes.DELETE_ORDER, order_id=order_id)
 
-    def is_command_fully_closed(self, command_id: str) -> Optional[Response]:
+    def is_command_fully_closed(self, command_id: str) -> Optional[ApiResponse]:
         """Checks if a command is fully closed."""
-        return self.get("comandalivre/orders/is-command-fully-closed", params={"commandId": command_id})
+        return self._call(routes.IS_COMMAND_FULLY_CLOSED, params={"commandId": command_id})
 
-    def auth(self)-> Optional[Response]:
+    def auth(self)-> Optional[ApiResponse]:
         """
         Authenticates a user e retorna os dados do usuario
         """
-        result = self.post("shared/users/auth",data={})
+        return self._call(routes.AUTH, data={})
+
+    # --- Paginated iterators ---
+    # Each walks every page of a PageDTO endpoint and yields single items,
+    # reading the next page ahead (see `data_test.core.pagination`). On
+    # AsyncApiClient they are async iterators.
+
+    def _paginate(self, fetch: Callable, params: Optional[Dict], page_size: int):
+        """Iterates over the items of a paginated endpoint. Implemented by the concrete clients."""
+        raise NotImplementedError
+
+    def iter_public_companies(self, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE):
+        """Iterates over every public company."""
+        return self._paginate(self.get_public_companies, params, page_size)
+
+    def iter_public_products(self, company_id: str, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE):
+        """Iterates over every public product of a company."""
+        return self._paginate(lambda page: self.get_public_products(company_id, page), params, page_size)
+
+    def iter_tables(self, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE):
+        """Iterates over every table matching `params`."""
+        return self._paginate(self.get_tables, params, page_size)
+
+    def iter_employee_invites_by_company(
+        self, company_id: str, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE
+    ):
+        """Iterates over every employee invite of a company."""
+        return self._paginate(lambda page: self.get_employee_invites_by_company(company_id, page), params, page_size)
+
+    def iter_my_employee_invites(self, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE):
+        """Iterates over every employee invite of the current user."""
+        return self._paginate(self.get_my_employee_invites, params, page_size)
+
+    def iter_orders(self, params: Optional[Dict] = None, page_size: int = PAGINATION_PAGE_SIZE):
+        """Iterates over every order matching `params` (e.g. {"commandId": ...})."""
+        return self._paginate(self.get_orders, params, page_size)
+
+
+class ApiClient(BaseApiClient):
+    """
+    A client to interact with the application's REST API.
+    """
+
+    def __init__(
+        self,
+        session: Optional[HttpSession] = None,
+        token: Optional[str] = None,
+        http2: bool = HTTP2_ENABLED,
+        hedging: Optional[HedgingPolicy] = None,
+        phase_timing: bool = PHASE_TIMING_ENABLED,
+    ):
+        """
+        Initializes the HTTP session and the auth headers.
+
+        Passing an existing `session` shares its connection pool; this is how
+        `for_token` creates one lightweight client per identity. Otherwise an
+        instrumented pool sized by the HTTP_POOL_* settings is created, over
+        HTTP/2 when `http2` is set and the 'h2' package is available.
+        With a `hedging` policy, slow GET requests are duplicated. With
+        `phase_timing`, each request records its DNS, connect, TLS, time to
+        first byte and body durations, plus the backend's Server-Timing.
+        """
+        if session is None and http2:
+            # Plain-http gateways cannot negotiate HTTP/2, so use prior knowledge (h2c).
+            session = create_http2_client(prior_knowledge=API_BASE_URL.startswith("http://"))
+        self.session: HttpSession = session or create_session()
+        self.http2 = isinstance(self.session, httpx.Client)
+        self.hedging = hedging
+        self.phase_timing = phase_timing
+        self.token: Optional[str] = token
+        self.headers: Dict[str, str] = build_headers(token)
+
+    def for_token(self, token: str) -> "ApiClient":
+        """Returns a client acting with `token` that shares this client's connection pool."""
+        return type(self)(session=self.session, token=token, hedging=self.hedging, phase_timing=self.phase_timing)
+
+    def _paginate(self, fetch: Callable, params: Optional[Dict], page_size: int) -> Iterator[Any]:
+        return iter_items(fetch, params, page_size)
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Returns the connection pool counters (see `data_test.core.http_pool`)."""
+        return session_pool_stats(self.session)
+
+    def close(self):
+        """Closes every pooled connection, including those of the clients sharing this session."""
+        self.session.close()
+
+    def _make_request(
+        self, method: str, endpoint: str, route: Optional[Route] = None, **kwargs
+    ) -> Optional[ApiResponse]:
+        """
+        A generic request maker to handle exceptions and logging.
+
+        Reference-data routes may be answered from `reference_cache`, and
+        GETs are sent conditionally when validators are known (see
+        `data_test.core.conditional`).
+        Idempotent requests are retried and routes with an open circuit are
+        short-circuited, see `data_test.core.resilience`.
+        """
+        # The actor headers are built once; only merge when a call adds its own.
+        headers = self.headers
+        if 'headers' in kwargs:
+            headers = {**headers, **kwargs.pop('headers')}
+
+        cache_key = reference_cache.key(route, endpoint, kwargs.get("params")) if route is not None else None
+        if cache_key is not None:
+            cached = reference_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        resource_key = validator_cache.key(route, endpoint, kwargs.get("params"), headers) if route is not None else None
+        validators = validator_cache.request_headers(resource_key) if resource_key is not None else {}
+        request_headers = {**headers, **validators} if validators else headers
+
+        key = self._metric_key(method, endpoint, route)
+        admitted, breaker = self._admit(key)
+        if not admitted:
+            return None
+
+        result = None
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            error = None
+            start = time.perf_counter()
+            phases = None
+            try:
+                if self.hedging is not None and route is not None and self.hedging.applies_to(route):
+                    response = self.hedging.send(
+                        route, lambda: self.session.request(method, endpoint, timeout=15, headers=request_headers, **kwargs)
+                    )
+                elif self.phase_timing and not self.http2:
+                    phases = {}
+                    response = self._timed_request(method, endpoint, request_headers, phases, kwargs)
+                else:
+                    response = self.session.request(method, endpoint, timeout=15, headers=request_headers, **kwargs)
+            except (requests.exceptions.RequestException, httpx.HTTPError) as e:
+                error = e
+            except BaseException:
+                # Settle the attempt before it propagates, so a half-open
+                # circuit does not wait forever for its probe's outcome.
+                if breaker is not None:
+                    breaker.record(True)
+                raise
+            finally:
+                self._record(key, start, response, phases)
+            delay = self._retry_delay(key, method, attempt, response, breaker)
+            if delay is None:
+                if validators and response is not None and response.status_code == 304:
+                    result = validator_cache.resolve(route, resource_key, ApiResponse(response), True)
+                    if result is None:
+                        # The stored response was evicted while the 304 was in
+                        # flight: send it again without validators, under the
+                        # same admission.
+                        validators = {}
+                        request_headers = headers
+                        continue
+                break
+            time.sleep(delay)
+
+        if response is None:
+            logging.error(f"Request to {endpoint} failed: {error}")
+            return None
+        if result is None:
+            result = ApiResponse(response)
+            if resource_key is not None:
+                result = validator_cache.resolve(route, resource_key, result, bool(validators))
+        if cache_key is not None:
+            reference_cache.put(cache_key, result)
         return result
 
+    def _timed_request(self, method: str, endpoint: str, headers: Dict[str, str], phases: Dict[str, float], kwargs):
+        """
+        Sends a request and fills `phases` with its timing breakdown.
+
+        The body is streamed so that time to first byte (from sending the
+        request to receiving the headers, connection setup excluded) and
+        body transfer are measured separately. Hedged requests are not
+        broken down, as their attempts run on other threads.
+        """
+        context_token = connection_phases.set(phases)
+        try:
+            start = time.perf_counter()
+            response = self.session.request(method, endpoint, timeout=15, headers=headers, stream=True, **kwargs)
+            headers_received = time.perf_counter()
+            response.content
+            phases["body"] = time.perf_counter() - headers_received
+        finally:
+            connection_phases.reset(context_token)
+        setup = phases.get("dns", 0.0) + phases.get("connect", 0.0) + phases.get("tls", 0.0)
+        phases["ttfb"] = max(0.0, headers_received - start - setup)
+        phases.update(parse_server_timing(response.headers.get("Server-Timing")))
+        return response
+
+    def set_token(self, token: str):
+        """
+        Replaces the auth token of this client.
+
+        Prefer `for_token` when several identities are in use, so that each
+        one keeps its own client instead of swapping tokens on a shared one.
+        """
+        self.token = token
+        self.headers = build_headers(token)
+        if not token:
+            logging.warning("No auth token set. Making unauthenticated request.")
 
-    def authenticate_with_keycloak(self, username: Optional[str] = None, password: Optional[str] = None) -> Optional[Response]:
+    def authenticate_with_keycloak(self, username: Optional[str] = None, password: Optional[str] = None) -> Optional[ApiResponse]:
         """
         Authenticates against Keycloak using the password grant type.
         This is for testing purposes, simulating a backend client.
@@ -269,34 +526,32 @@ class ApiClient:
         # that uses a different Content-Type and doesn't rely on the session's bearer token.
         try:
             response = requests.post(KEYCLOAK_TOKEN_ENDPOINT, data=payload, headers=headers, timeout=15)
-            return response
+            return ApiResponse(response)
         except requests.exceptions.RequestException as e:
             logging.error(f"Keycloak authentication request failed: {e}")
             return None
 
-    def authenticate_keycloak_admin(self) -> Optional[str]:
-        """Authenticates as Keycloak admin and returns an access token."""
+    def refresh_keycloak_token(self, refresh_token: str) -> Optional[ApiResponse]:
+        """
+        Exchanges a refresh token for a new token pair (refresh_token grant).
+        """
         payload = {
-            'grant_type': 'password',
-            'client_id': KEYCLOAK_ADMIN_CLIENT_ID,
-            'username': KEYCLOAK_ADMIN_USERNAME,
-            'password': KEYCLOAK_ADMIN_PASSWORD,
+            'grant_type': 'refresh_token',
+            'client_id': KEYCLOAK_CLIENT_ID,
+            'client_secret': KEYCLOAK_CLIENT_SECRET,
+            'refresh_token': refresh_token,
         }
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         try:
-            response = requests.post(KEYCLOAK_ADMIN_TOKEN_ENDPOINT, data=payload, headers=headers, timeout=15)
+            return ApiResponse(requests.post(KEYCLOAK_TOKEN_ENDPOINT, data=payload, headers=headers, timeout=15))
         except requests.exceptions.RequestException as e:
-            logging.error(f"Keycloak admin authentication request failed: {e}")
-            return None
-        if response.status_code != 200:
-            logging.error(f"Keycloak admin authentication failed: {response.status_code} {response.text}")
-            return None
-        try:
-            return response.json().get("access_token")
-        except ValueError:
-            logging.error("Keycloak admin authentication response is not valid JSON.")
+            logging.error(f"Keycloak token refresh request failed: {e}")
             return None
 
+    def authenticate_keycloak_admin(self) -> Optional[str]:
+        """Returns a Keycloak admin access token, cached until it expires."""
+        return keycloak_admin.admin_token()
+
     def create_keycloak_user(
         self,
         username: str,
@@ -304,75 +559,193 @@ class ApiClient:
         first_name: str,
         last_name: str,
         password: str,
-        realm: str = "comandalivre",
+        realm: str = KEYCLOAK_REALM,
     ) -> Optional[str]:
         """Creates a Keycloak user and returns its ID."""
-        admin_token = self.authenticate_keycloak_admin()
-        if not admin_token:
-            return None
+        return keycloak_admin.create_user(username, email, first_name, last_name, password, realm)
 
-        headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "application/json"}
-        user_payload = {
-            "username": username,
-            "email": email,
-            "enabled": True,
-            "emailVerified": True,
-            "firstName": first_name,
-            "lastName": last_name,
-            "credentials": [
-                {"type": "password", "value": password, "temporary": False}
-            ],
-        }
+    def find_keycloak_user_id(self, username: str, realm: str = KEYCLOAK_REALM) -> Optional[str]:
+        """Finds a Keycloak user ID by username."""
+        return keycloak_admin.find_user_id(username, realm)
 
-        try:
-            response = requests.post(
-                f"{KEYCLOAK_BASE_URL}/admin/realms/{realm}/users",
-                headers=headers,
-                json=user_payload,
-                timeout=15,
-            )
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Keycloak create user request failed: {e}")
-            return None
 
-        if response.status_code == 201:
-            location = response.headers.get("Location", "")
-            match = re.search(r"/([^/]+)$", location)
-            return match.group(1) if match else None
+class AsyncApiClient(BaseApiClient):
+    """
+    Asyncio counterpart of `ApiClient`, backed by a pooled `httpx.AsyncClient`.
 
-        if response.status_code == 409:
-            return self.find_keycloak_user_id(username, realm, admin_token)
+    Every endpoint method (`create_command`, `get_orders`, ...) returns a
+    coroutine, so many virtual users can share one event loop and one
+    connection pool. The client must be created and closed inside the
+    event loop that uses it.
+    """
 
-        logging.error(f"Keycloak create user failed: {response.status_code} {response.text}")
-        return None
+    def __init__(
+        self,
+        max_connections: int = ASYNC_MAX_CONNECTIONS,
+        max_keepalive_connections: int = ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+        client: Optional[httpx.AsyncClient] = None,
+        token: Optional[str] = None,
+        http2: bool = HTTP2_ENABLED,
+        hedging: Optional[HedgingPolicy] = None,
+        phase_timing: bool = PHASE_TIMING_ENABLED,
+    ):
+        """
+        Initializes the async connection pool and the auth headers.
 
-    def find_keycloak_user_id(self, username: str, realm: str, admin_token: str) -> Optional[str]:
-        """Finds a Keycloak user ID by username."""
-        headers = {"Authorization": f"Bearer {admin_token}"}
-        try:
-            response = requests.get(
-                f"{KEYCLOAK_BASE_URL}/admin/realms/{realm}/users",
-                headers=headers,
-                params={"username": username},
-                timeout=15,
+        Passing an existing `client` shares its pool instead of opening a new one.
+        With `http2`, requests are multiplexed over HTTP/2 connections.
+        `hedging` and `phase_timing` work as in `ApiClient`.
+        """
+        self._owns_client = client is None
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
             )
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Keycloak lookup user request failed: {e}")
-            return None
-        if response.status_code != 200:
-            logging.error(f"Keycloak lookup user failed: {response.status_code} {response.text}")
-            return None
-        try:
-            users = response.json()
-        except ValueError:
-            logging.error("Keycloak lookup user response is not valid JSON.")
+            try:
+                client = httpx.AsyncClient(
+                    limits=limits, timeout=15, http2=http2, http1=not (http2 and API_BASE_URL.startswith("http://"))
+                )
+            except ImportError:
+                logging.warning("HTTP/2 needs the 'h2' package (pip install data-test[http2]); using HTTP/1.1.")
+                client = httpx.AsyncClient(limits=limits, timeout=15)
+        self.client: httpx.AsyncClient = client
+        self.hedging = hedging
+        self.phase_timing = phase_timing
+        self.token: Optional[str] = token
+        self.headers: Dict[str, str] = build_headers(token)
+
+    def for_token(self, token: str) -> "AsyncApiClient":
+        """Returns a client acting with `token` that shares this client's connection pool."""
+        return type(self)(client=self.client, token=token, hedging=self.hedging, phase_timing=self.phase_timing)
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes every pooled connection, unless the pool is borrowed from another client."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _make_request(
+        self, method: str, endpoint: str, route: Optional[Route] = None, **kwargs
+    ) -> Optional[ApiResponse]:
+        """
+        A generic request maker to handle exceptions and logging.
+
+        Reference-data routes may be answered from `reference_cache`, and
+        GETs are sent conditionally when validators are known (see
+        `data_test.core.conditional`).
+        Idempotent requests are retried and routes with an open circuit are
+        short-circuited, see `data_test.core.resilience`.
+        """
+        headers = self.headers
+        if 'headers' in kwargs:
+            headers = {**headers, **kwargs.pop('headers')}
+        cache_key = reference_cache.key(route, endpoint, kwargs.get("params")) if route is not None else None
+        if cache_key is not None:
+            cached = reference_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        resource_key = validator_cache.key(route, endpoint, kwargs.get("params"), headers) if route is not None else None
+        validators = validator_cache.request_headers(resource_key) if resource_key is not None else {}
+        request_headers = {**headers, **validators} if validators else headers
+
+        key = self._metric_key(method, endpoint, route)
+        admitted, breaker = self._admit(key)
+        if not admitted:
             return None
-        if not users:
+
+        result = None
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            error = None
+            start = time.perf_counter()
+            phases = None
+            try:
+                if self.hedging is not None and route is not None and self.hedging.applies_to(route):
+                    response = await self.hedging.send_async(
+                        route, lambda: self.client.request(method, endpoint, headers=request_headers, **kwargs)
+                    )
+                elif self.phase_timing:
+                    phases = {}
+                    response = await self.client.request(
+                        method, endpoint, headers=request_headers, extensions={"trace": phase_trace(phases)}, **kwargs
+                    )
+                    phases.update(parse_server_timing(response.headers.get("Server-Timing")))
+                else:
+                    response = await self.client.request(method, endpoint, headers=request_headers, **kwargs)
+            except httpx.HTTPError as e:
+                error = e
+            except BaseException:
+                # Settle the attempt before it propagates, so a half-open
+                # circuit does not wait forever for its probe's outcome.
+                if breaker is not None:
+                    breaker.record(True)
+                raise
+            finally:
+                self._record(key, start, response, phases)
+            delay = self._retry_delay(key, method, attempt, response, breaker)
+            if delay is None:
+                if validators and response is not None and response.status_code == 304:
+                    result = validator_cache.resolve(route, resource_key, ApiResponse(response), True)
+                    if result is None:
+                        # The stored response was evicted while the 304 was in
+                        # flight: send it again without validators, under the
+                        # same admission.
+                        validators = {}
+                        request_headers = headers
+                        continue
+                break
+            await asyncio.sleep(delay)
+
+        if response is None:
+            logging.error(f"Request to {endpoint} failed: {error}")
             return None
-        return users[0].get("id")
+        if result is None:
+            result = ApiResponse(response)
+            if resource_key is not None:
+                result = validator_cache.resolve(route, resource_key, result, bool(validators))
+        if cache_key is not None:
+            reference_cache.put(cache_key, result)
+        return result
+
+    def _paginate(self, fetch: Callable, params: Optional[Dict], page_size: int) -> AsyncIterator[Any]:
+        return aiter_items(fetch, params, page_size)
 
+    def set_token(self, token: str):
+        """Replaces the auth token of this client. Prefer `for_token` for new identities."""
+        self.token = token
+        self.headers = build_headers(token)
+        if not token:
+            logging.warning("No auth token set. Making unauthenticated request.")
 
+    async def authenticate_with_keycloak(
+        self, username: Optional[str] = None, password: Optional[str] = None
+    ) -> Optional[ApiResponse]:
+        """
+        Authenticates against Keycloak using the password grant type.
+        """
+        payload = {
+            'grant_type': 'password',
+            'client_id': KEYCLOAK_CLIENT_ID,
+            'client_secret': KEYCLOAK_CLIENT_SECRET,
+            'username': username or TEST_USER_USERNAME,
+            'password': password or TEST_USER_PASSWORD,
+        }
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        try:
+            return ApiResponse(await self.client.post(KEYCLOAK_TOKEN_ENDPOINT, data=payload, headers=headers))
+        except httpx.HTTPError as e:
+            logging.error(f"Keycloak authentication request failed: {e}")
+            return None
 
 
 # --- Singleton Instance ---
-api_client = ApiClient()
+# Created on first use, so importing a story does not open a session.
+api_client: ApiClient = LazySingleton(ApiClient)
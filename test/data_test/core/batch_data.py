@@ -0,0 +1,121 @@
+"""
+Batch generation of pt_BR phones, CNPJs and prices.
+
+Seeding tens of thousands of companies or products one Faker call at a time
+spends most of its time in per-item `random` calls. These functions draw the
+random digits of a whole batch at once, with NumPy when it is installed
+(`pip install data-test[fast]`) and with one `random.Random` call per field
+otherwise, and only format the strings per item. The output has the same
+format as the item-by-item generators: '(11) 98765-4321' phones, CNPJs with
+valid check digits, and prices between 1.00 and 99.00.
+
+NumPy is imported on the first batch, not with this module, so commands that
+never generate data do not pay for it at startup.
+"""
+import random
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+# DDDs of Brazilian mobile numbers; also used by PtBrPhoneProvider.
+AREA_CODES = (
+    "11", "12", "13", "14", "15", "16", "17", "18", "19",
+    "21", "22", "24", "27", "28", "31", "32", "33", "34",
+    "35", "37", "38", "41", "42", "43", "44", "45", "46",
+    "47", "48", "49", "51", "53", "54", "55", "61", "62",
+    "63", "64", "65", "66", "67", "68", "69", "71", "73",
+    "74", "75", "77", "79", "81", "82", "83", "84", "85",
+    "86", "87", "88", "89", "91", "92", "93", "94", "95",
+    "96", "97", "98", "99",
+)
+
+# CNPJ check digit weights; the first digit uses the last 12, the second all 13.
+CNPJ_WEIGHTS = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+# Branch number of the generated CNPJs (headquarters).
+CNPJ_BRANCH = "0001"
+
+PRICE_MIN_CENTS = 100
+PRICE_MAX_CENTS = 9900
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Returns the numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def cnpj_check_digits(digits: Sequence[int]) -> List[int]:
+    """Returns the two check digits of the first 12 digits of a CNPJ."""
+    digits = list(digits[:12])
+    for weights in (CNPJ_WEIGHTS[1:], CNPJ_WEIGHTS):
+        remainder = sum(weight * digit for weight, digit in zip(weights, digits)) % 11
+        digits.append(0 if remainder < 2 else 11 - remainder)
+    return digits[12:]
+
+
+def _format_cnpj(root: int, first: int, second: int) -> str:
+    root_digits = f"{root:08d}"
+    return f"{root_digits[:2]}.{root_digits[2:5]}.{root_digits[5:]}/{CNPJ_BRANCH}-{first}{second}"
+
+
+def cnpj_for(root: int) -> str:
+    """Returns the headquarters CNPJ of an 8-digit root, e.g. a sequence number for unique CNPJs."""
+    branch = [int(digit) for digit in CNPJ_BRANCH]
+    first, second = cnpj_check_digits([int(digit) for digit in f"{root % 10 ** 8:08d}"] + branch)
+    return _format_cnpj(root % 10 ** 8, first, second)
+
+
+def generate_phones(count: int, seed: Optional[int] = None) -> List[str]:
+    """Generates `count` mobile numbers formatted as '(AA) 9NNNN-NNNN'."""
+    np = _numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        areas = rng.integers(0, len(AREA_CODES), count).tolist()
+        # First block: 7-9 followed by three digits; second block: four digits.
+        heads = rng.integers(7000, 10000, count).tolist()
+        tails = rng.integers(0, 10000, count).tolist()
+        return [
+            f"({AREA_CODES[area]}) 9{head}-{tail:04d}"
+            for area, head, tail in zip(areas, heads, tails)
+        ]
+    rng = random.Random(seed)
+    return [
+        f"({rng.choice(AREA_CODES)}) 9{rng.randrange(7000, 10000)}-{rng.randrange(10000):04d}"
+        for _ in range(count)
+    ]
+
+
+def generate_cnpjs(count: int, seed: Optional[int] = None) -> List[str]:
+    """Generates `count` headquarters CNPJs ('NN.NNN.NNN/0001-DD') with valid check digits."""
+    branch = [int(digit) for digit in CNPJ_BRANCH]
+    np = _numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        roots = rng.integers(0, 10 ** 8, count)
+        digits = np.empty((count, 14), dtype=np.int64)
+        digits[:, :8] = (roots[:, None] // 10 ** np.arange(7, -1, -1)) % 10
+        digits[:, 8:12] = branch
+        weights = np.array(CNPJ_WEIGHTS)
+        for position, row_weights in ((12, weights[1:]), (13, weights)):
+            remainder = digits[:, :position] @ row_weights % 11
+            digits[:, position] = np.where(remainder < 2, 0, 11 - remainder)
+        return [
+            _format_cnpj(root, first, second)
+            for root, first, second in zip(roots.tolist(), digits[:, 12].tolist(), digits[:, 13].tolist())
+        ]
+    rng = random.Random(seed)
+    return [cnpj_for(rng.randrange(10 ** 8)) for _ in range(count)]
+
+
+def generate_prices(count: int, seed: Optional[int] = None) -> List[str]:
+    """Generates `count` prices between 1.00 and 99.00 as decimal strings with two places."""
+    np = _numpy()
+    if np is not None:
+        cents = np.random.default_rng(seed).integers(PRICE_MIN_CENTS, PRICE_MAX_CENTS + 1, count).tolist()
+    else:
+        rng = random.Random(seed)
+        cents = [rng.randint(PRICE_MIN_CENTS, PRICE_MAX_CENTS) for _ in range(count)]
+    return [f"{value // 100}.{value % 100:02d}" for value in cents]
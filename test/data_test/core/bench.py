@@ -0,0 +1,245 @@
+"""
+Benchmarks of the harness itself, run by the `bench` CLI commands.
+
+They measure the cost of the load generator rather than of the backend, so
+tuning decisions (transport, data pools, ...) can be checked against the same
+request rate on the same machine.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from data_test.core.api_client import ApiClient
+from data_test.core.conditional import validator_cache
+from data_test.core.config import BASE_DIR
+from data_test.core.data_generator import DataGenerator
+from data_test.core.metrics import LatencyHistogram
+from data_test.core.reference_cache import reference_cache
+from data_test.core.resilience import circuit_breakers, retry_policy
+
+
+@dataclass
+class TransportBenchmark:
+    """Outcome of one transport run at a fixed request rate."""
+    transport: str
+    requests: int
+    errors: int
+    connections: int
+    cpu_seconds: float
+    wall_seconds: float
+    p50: float
+    p99: float
+
+    @property
+    def cpu_percent(self) -> float:
+        """Process CPU time as a share of one core over the run."""
+        return 100 * self.cpu_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+@contextmanager
+def _plain_requests() -> Iterator[None]:
+    """
+    Turns off the client-side features that change what goes on the wire
+    (reference cache, conditional GETs, retries, circuit breakers) and
+    restores them afterwards.
+    """
+    saved = (
+        reference_cache.enabled, validator_cache.enabled,
+        retry_policy.max_attempts, circuit_breakers.failure_threshold,
+    )
+    reference_cache.enabled = validator_cache.enabled = False
+    retry_policy.max_attempts = 1
+    circuit_breakers.failure_threshold = 0
+    try:
+        yield
+    finally:
+        (
+            reference_cache.enabled, validator_cache.enabled,
+            retry_policy.max_attempts, circuit_breakers.failure_threshold,
+        ) = saved
+
+
+def benchmark_transport(http2: bool, rate: float, duration: float, workers: int) -> TransportBenchmark:
+    """
+    Sends `rate` GET company/companies requests per second for `duration` seconds.
+
+    Requests start on a fixed schedule and run on `workers` threads sharing
+    one client. Latency is measured from each request's scheduled start, so
+    a saturated transport shows up in the p99 instead of lowering the rate.
+    Every request is a full 200: caching, conditional GETs, retries, circuit
+    breakers, hedging and phase timing are all off during the run.
+    """
+    with _plain_requests():
+        return _run_transport(http2, rate, duration, workers)
+
+
+def _run_transport(http2: bool, rate: float, duration: float, workers: int) -> TransportBenchmark:
+    client = ApiClient(http2=http2, hedging=None, phase_timing=False)
+    latency = LatencyHistogram()
+    lock = threading.Lock()
+    errors = 0
+
+    def send(intended: float):
+        nonlocal errors
+        response = client.get_public_companies()
+        elapsed = time.perf_counter() - intended
+        with lock:
+            latency.record(elapsed)
+            if not response:
+                errors += 1
+
+    total = int(rate * duration)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index in range(total):
+            intended = start + index / rate
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, intended)
+    wall_seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+
+    stats = client.pool_stats() or {}
+    client.close()
+    return TransportBenchmark(
+        transport="HTTP/2" if client.http2 else "HTTP/1.1",
+        requests=total,
+        errors=errors,
+        connections=stats.get("new_connections", 0),
+        cpu_seconds=cpu_seconds,
+        wall_seconds=wall_seconds,
+        p50=latency.percentile(50),
+        p99=latency.percentile(99),
+    )
+
+
+@dataclass
+class DataGenBenchmark:
+    """Outcome of generating the same payload mix directly or from pools."""
+    mode: str
+    payloads: int
+    fill_seconds: float
+    cpu_seconds: float
+
+    @property
+    def microseconds_per_payload(self) -> float:
+        return 1_000_000 * self.cpu_seconds / self.payloads if self.payloads else 0.0
+
+    @property
+    def payloads_per_second(self) -> float:
+        return self.payloads / self.cpu_seconds if self.cpu_seconds > 0 else 0.0
+
+
+def _generate_payload_mix(generator: DataGenerator, rounds: int) -> int:
+    """Builds the payloads of a typical story iteration `rounds` times; returns the number built."""
+    for _ in range(rounds):
+        generator.generate_user_data()
+        generator.generate_company_data()
+        generator.generate_product_data("company", "category")
+        generator.generate_table_data("company", "Mesa")
+        generator.generate_command_data("table", "employee")
+        generator.generate_order_form("command", ["p1", "p2", "p3"])
+    return rounds * 6
+
+
+def benchmark_datagen(pooled: bool, rounds: int, pool_size: int) -> DataGenBenchmark:
+    """
+    Measures the CPU time of building `rounds` payload mixes.
+
+    In pooled mode a first round fills the pools; its cost is reported
+    separately as `fill_seconds`, since a real run pays it once at startup.
+    """
+    generator = DataGenerator(pooled=pooled, pool_size=pool_size, background_refill=False)
+    fill_seconds = 0.0
+    if pooled:
+        fill_start = time.process_time()
+        _generate_payload_mix(generator, 1)
+        fill_seconds = time.process_time() - fill_start
+    cpu_start = time.process_time()
+    payloads = _generate_payload_mix(generator, rounds)
+    return DataGenBenchmark(
+        mode="pooled" if pooled else "direct",
+        payloads=payloads,
+        fill_seconds=fill_seconds,
+        cpu_seconds=time.process_time() - cpu_start,
+    )
+
+
+# Modules that the CLI must not import until a command needs them.
+DEFERRED_MODULES = ("faker", "jwt", "numpy", "httpx", "requests")
+
+# Runs 'list-stories' and prints, as the last line, the modules it loaded.
+_STARTUP_PROBE = (
+    "import json, sys\n"
+    "from data_test.cli.main import app\n"
+    "app(['list-stories'], standalone_mode=False)\n"
+    "print(json.dumps(sorted(sys.modules)))\n"
+)
+
+
+@dataclass
+class StartupBenchmark:
+    """Cold start of the CLI running 'list-stories' in a fresh interpreter."""
+    runs: int
+    wall_seconds: float
+    import_seconds: float
+    slowest_imports: List[Tuple[str, float]] = field(default_factory=list)
+    eager_modules: List[str] = field(default_factory=list)
+
+
+def _parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Returns the cumulative import time of the CLI and the per-module self times of `-X importtime` output."""
+    total = 0.0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        modules.append((name, int(self_us) / 1_000_000))
+        if name == "data_test.cli.main":
+            total = int(cumulative_us) / 1_000_000
+    return total, sorted(modules, key=lambda item: item[1], reverse=True)
+
+
+def benchmark_startup(runs: int, top: int = 10) -> StartupBenchmark:
+    """
+    Starts `runs` fresh interpreters running 'list-stories' under `-X importtime`.
+
+    The wall time is the median over the runs and includes interpreter
+    startup; import times come from the last run.
+    """
+    walls = []
+    stdout = stderr = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _STARTUP_PROBE],
+            cwd=BASE_DIR.parent,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        walls.append(time.perf_counter() - start)
+        stdout, stderr = completed.stdout, completed.stderr
+
+    import_seconds, modules = _parse_importtime(stderr)
+    loaded = set(json.loads(stdout.strip().splitlines()[-1]))
+    return StartupBenchmark(
+        runs=runs,
+        wall_seconds=statistics.median(walls),
+        import_seconds=import_seconds,
+        slowest_imports=modules[:top],
+        eager_modules=[name for name in DEFERRED_MODULES if name in loaded],
+    )
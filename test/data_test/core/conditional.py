@@ -0,0 +1,162 @@
+"""
+Conditional GET support for the API clients.
+
+When a GET response carries an `ETag` or `Last-Modified` validator, the
+response is kept per resource (URL and query parameters) and per caller
+identity. The next GET of the same resource by the same caller sends
+`If-None-Match` / `If-Modified-Since`; if the backend answers 304 Not
+Modified, the client returns the kept response, so callers always see the
+full 200 body.
+
+Authenticated responses may depend on who asks (the same URL lists other
+invites for another user), and an ETag is not guaranteed to vary with the
+caller, so the identity is part of the key: a digest of the Authorization
+header, or none for anonymous requests. If the kept response was evicted
+between sending the validators and receiving the 304, `resolve` returns
+None and the client sends the GET again without validators.
+
+Per route, `ValidatorCache.snapshot` reports how many GETs were sent
+conditionally, the share answered with 304 and the body bytes that did not
+have to be downloaded. The cache is off unless CONDITIONAL_GET_ENABLED is
+set or `run --conditional-get` is given, so baseline runs are unchanged.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from data_test.core.config import CONDITIONAL_GET_ENABLED, CONDITIONAL_GET_MAX_ENTRIES
+from data_test.core.response import ApiResponse
+from data_test.core.routes import Route
+
+ResourceKey = Tuple[Optional[bytes], str, Hashable]
+
+
+@dataclass
+class _Validated:
+    """A stored response and its validators."""
+    response: ApiResponse
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class ConditionalStats:
+    """Conditional GET counters of one route template."""
+    requests: int = 0
+    conditional: int = 0
+    not_modified: int = 0
+    bytes_received: int = 0
+    bytes_saved: int = 0
+
+
+class ValidatorCache:
+    """
+    Thread-safe LRU of validated GET responses, with per-route counters.
+    """
+
+    def __init__(self, max_entries: int = CONDITIONAL_GET_MAX_ENTRIES, enabled: bool = CONDITIONAL_GET_ENABLED):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[ResourceKey, _Validated]" = OrderedDict()
+        self._stats: Dict[str, ConditionalStats] = {}
+        self._lock = threading.Lock()
+
+    def key(
+        self, route: Route, endpoint: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]
+    ) -> Optional[ResourceKey]:
+        """
+        Returns the resource key of a request, or None when it is not a conditional candidate.
+
+        `headers` are the request headers; their Authorization value scopes the key to the caller.
+        """
+        if not (self.enabled and route.method == "GET"):
+            return None
+        authorization = headers.get("Authorization")
+        identity = hashlib.blake2b(authorization.encode(), digest_size=16).digest() if authorization else None
+        return identity, endpoint, tuple(sorted(params.items())) if params else None
+
+    def _route_stats(self, route: Route) -> ConditionalStats:
+        """Called with the lock held."""
+        stats = self._stats.get(route.key)
+        if stats is None:
+            stats = self._stats[route.key] = ConditionalStats()
+        return stats
+
+    def request_headers(self, key: ResourceKey) -> Dict[str, str]:
+        """Returns the conditional headers for a resource (empty when nothing is stored)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.headers() if entry is not None else {}
+
+    def resolve(
+        self, route: Route, key: ResourceKey, response: ApiResponse, conditional: bool
+    ) -> Optional[ApiResponse]:
+        """
+        Returns the response the caller should see and updates the counters.
+
+        A 304 is replaced by the stored response; a 200 with validators is
+        stored. Returns None for a 304 whose stored response is gone, which
+        the caller must send again unconditionally.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if response.status_code == 304 and entry is None and conditional:
+                return None
+            stats = self._route_stats(route)
+            stats.requests += 1
+            if conditional:
+                stats.conditional += 1
+            if response.status_code == 304 and entry is not None:
+                stats.not_modified += 1
+                stats.bytes_saved += len(entry.response.content)
+                self._entries.move_to_end(key)
+                return entry.response
+
+            if response.status_code == 200:
+                stats.bytes_received += len(response.content)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._entries[key] = _Validated(response, etag, last_modified)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                elif entry is not None:
+                    del self._entries[key]
+            return response
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Returns one row per route with conditional requests, sorted by route."""
+        with self._lock:
+            return [
+                {
+                    "route": route_key,
+                    "requests": stats.requests,
+                    "conditional": stats.conditional,
+                    "not_modified": stats.not_modified,
+                    "not_modified_ratio": stats.not_modified / stats.conditional if stats.conditional else 0.0,
+                    "bytes_received": stats.bytes_received,
+                    "bytes_saved": stats.bytes_saved,
+                }
+                for route_key, stats in sorted(self._stats.items())
+                if stats.conditional
+            ]
+
+    def invalidate(self):
+        """Drops every stored response."""
+        with self._lock:
+            self._entries.clear()
+
+
+# --- Singleton Instance ---
+validator_cache = ValidatorCache()
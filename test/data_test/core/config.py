@@ -37,10 +37,19 @@ KEYCLOAK_ADMIN_TOKEN_ENDPOINT = (
     f"{KEYCLOAK_BASE_URL}/realms/{KEYCLOAK_ADMIN_REALM}/protocol/openid-connect/token"
 )
 
+# Connections kept alive by the admin session; also the default provisioning parallelism.
+KEYCLOAK_ADMIN_POOL_SIZE = int(os.getenv("KEYCLOAK_ADMIN_POOL_SIZE", 16))
+
+# Pre-provisioned test users (see 'users provision'), one JSON object per line.
+USER_POOL_FILE = Path(os.getenv("USER_POOL_FILE", BASE_DIR.parent / "data" / "user_pool.jsonl"))
+
 # Backend client with direct access grant enabled
 KEYCLOAK_CLIENT_ID = "backend"
 KEYCLOAK_CLIENT_SECRET = "backend-secret-fixa-123"
 
+# Cached access tokens are renewed this many seconds before their JWT 'exp'.
+TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("TOKEN_REFRESH_MARGIN_SECONDS", 30))
+
 # Pre-configured test user
 TEST_USER_USERNAME = "teste@comandalivre.com.br"
 TEST_USER_PASSWORD = "teste123"
@@ -51,6 +60,55 @@ TEST_USER_PASSWORD = "teste123"
 # The number of iterations can be configured via environment variables.
 ITERATION_COUNT = int(os.getenv("ITERATION_COUNT", 1))
 
+# --- Load Configuration ---
+# Connection pool used by the asyncio client when stories run concurrently.
+ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", 100))
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ASYNC_MAX_KEEPALIVE_CONNECTIONS", 100))
+# Connection pool of the blocking client (requests/urllib3): number of hosts
+# with a cached pool, connections kept per host, whether a request waits for
+# a free connection instead of opening an extra one, and HTTP keep-alive.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 100))
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+# Break each request of the blocking client down into DNS, connect, TLS,
+# time to first byte and body transfer (see 'run --phase-timing').
+PHASE_TIMING_ENABLED = os.getenv("PHASE_TIMING_ENABLED", "false").lower() == "true"
+# Send API traffic over HTTP/2 (httpx + h2) instead of HTTP/1.1 (requests).
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+# Hedged GET requests (opt-in, see 'run --hedge-percentile'): samples needed
+# before a route's percentile is trusted, the delay used until then, and the
+# threads available for concurrent attempts.
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("HEDGE_DEFAULT_DELAY_SECONDS", 0.2))
+HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", 64))
+# Retries of idempotent requests: attempts per request (1, the default,
+# disables them), full-jitter backoff bounds, and retries allowed as a
+# fraction of all requests.
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", 1))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", 0.1))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", 2.0))
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", 0.1))
+# Per-route circuit breaker: consecutive failures that open it (0, the
+# default, disables it) and seconds it stays open before letting a probe
+# request through.
+CIRCUIT_BREAKER_FAILURES = int(os.getenv("CIRCUIT_BREAKER_FAILURES", 0))
+CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", 5.0))
+# Client-side cache of reference data (categories, role and company types).
+REFERENCE_CACHE_ENABLED = os.getenv("REFERENCE_CACHE_ENABLED", "true").lower() == "true"
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", 300))
+REFERENCE_CACHE_MAX_ENTRIES = int(os.getenv("REFERENCE_CACHE_MAX_ENTRIES", 256))
+# Conditional GETs (off by default, see 'run --conditional-get'): validators
+# (ETag, Last-Modified) and bodies kept for at most this many resources.
+CONDITIONAL_GET_ENABLED = os.getenv("CONDITIONAL_GET_ENABLED", "false").lower() == "true"
+CONDITIONAL_GET_MAX_ENTRIES = int(os.getenv("CONDITIONAL_GET_MAX_ENTRIES", 1024))
+# Page size requested by the paginated iterators (iter_* client methods).
+PAGINATION_PAGE_SIZE = int(os.getenv("PAGINATION_PAGE_SIZE", 100))
+
+# --- Startup Budget ---
+# Cold start of 'list-stories' (interpreter + imports) allowed by 'bench startup'.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 500))
+
 # --- Logging Configuration ---
 LOG_DIR = BASE_DIR.parent / "logs"
 LOG_FILE = LOG_DIR / "integration_test.log"
@@ -58,6 +116,16 @@ LOG_LEVEL = logging.INFO
 
 # --- Faker Configuration ---
 FAKER_LOCALE = "pt_BR"
+# Pooled data generation (see 'run --data-pool'): Faker values are generated
+# in batches of this size into ring buffers, optionally refreshed by a
+# background thread; without it each pool is filled once and then reused.
+DATA_POOL_ENABLED = os.getenv("DATA_POOL_ENABLED", "false").lower() == "true"
+DATA_POOL_SIZE = int(os.getenv("DATA_POOL_SIZE", 5000))
+DATA_POOL_BACKGROUND_REFILL = os.getenv("DATA_POOL_BACKGROUND_REFILL", "false").lower() == "true"
+# Workload shape (see data_test.core.distributions): Zipf exponent of product
+# popularity (0 picks uniformly) and the named order-size distribution.
+PRODUCT_ZIPF_EXPONENT = float(os.getenv("PRODUCT_ZIPF_EXPONENT", 0.0))
+ORDER_SIZE_DISTRIBUTION = os.getenv("ORDER_SIZE_DISTRIBUTION", "restaurant")
 
 
 def setup_logging():
@@ -1,66 +1,189 @@
+import hashlib
+import itertools
 import logging
 import re
-from typing import Dict, Any, List, Optional
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from faker import Faker
-from faker.providers import BaseProvider
-# from faker_br.providers.cnpj import Provider as CnpjProvider # Removed this import
+from data_test.core.batch_data import generate_cnpjs, generate_phones, generate_prices
+from data_test.core.config import (
+    DATA_POOL_BACKGROUND_REFILL,
+    DATA_POOL_ENABLED,
+    DATA_POOL_SIZE,
+    FAKER_LOCALE,
+    ORDER_SIZE_DISTRIBUTION,
+    PRODUCT_ZIPF_EXPONENT,
+)
+from data_test.core.data_pool import DataPools
+from data_test.core.distributions import ORDER_SIZES, OrderSizes, ZipfPopularity
 
-from data_test.core.config import FAKER_LOCALE
+# Faker providers the generator uses. Faker loads every provider of the
+# locale by default; naming them keeps building a generator cheap.
+FAKER_PROVIDERS = (
+    "faker.providers.address",
+    "faker.providers.company",
+    "faker.providers.lorem",
+    "faker.providers.misc",
+    "faker.providers.person",
+    "faker.providers.python",
+)
 
-import random
-import uuid # This import was missing from the original code and is needed for _generate_unique_email
 
-# --- Custom Provider for Brazilian Phone Numbers ---
+# --- DataGenerator Class ---
 
-class PtBrPhoneProvider(BaseProvider):
-    """
-    A Faker provider for generating Brazilian phone numbers in the common
-    format (XX) 9XXXX-XXXX.
-    """
-    def pt_br_cellphone(self) -> str:
-        """Generates a random Brazilian mobile phone number."""
-        area_code = self.random_element(
-            elements=(
-                "11", "12", "13", "14", "15", "16", "17", "18", "19",
-                "21", "22", "24", "27", "28", "31", "32", "33", "34",
-                "35", "37", "38", "41", "42", "43", "44", "45", "46",
-                "47", "48", "49", "51", "53", "54", "55", "61", "62",
-                "63", "64", "65", "66", "67", "68", "69", "71", "73",
-                "74", "75", "77", "79", "81", "82", "83", "84", "85",
-                "86", "87", "88", "89", "91", "92", "93", "94", "95",
-                "96", "97", "98", "99"
-            )
-        )
-        first_part = f"{random.randint(7, 9)}{''.join([str(random.randint(0, 9)) for _ in range(3)])}"
-        second_part = f"{''.join([str(random.randint(0, 9)) for _ in range(4)])}"
-        return f"({area_code}) 9{first_part}-{second_part}"
+def generate_unique_email(name: str, suffix: str) -> str:
+    """Generates a unique email from a name and a unique suffix (see `DataGenerator.unique_suffix`)."""
+    return f"{name.replace(' ', '').replace('.','')}.{suffix.lower()}@comandalivre-test.com"
 
 
-# --- DataGenerator Class ---
+def derive_seed(seed: int, *keys: Any) -> int:
+    """Derives an independent 64-bit seed for the stream identified by `keys`."""
+    material = "/".join(str(part) for part in (seed, *keys)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big")
+
 
-def generate_unique_email(name: str) -> str:
-    """Generates a unique email."""
-    return f"{name.replace(' ', '').replace('.','')}.{str(uuid.uuid4()).replace("-", "")[:8].lower()}@comandalivre-test.com"
+def split_name(full_name: str) -> Dict[str, str]:
+    """Splits a full name into the first/last name pair Keycloak expects."""
+    parts = full_name.strip().split()
+    if not parts:
+        return {"first_name": "Usuario", "last_name": "Teste"}
+    if len(parts) == 1:
+        return {"first_name": parts[0], "last_name": "Teste"}
+    return {"first_name": parts[0], "last_name": " ".join(parts[1:])}
 
 
 class DataGenerator:
     """
     Handles the generation of all necessary synthetic data for the tests.
+
+    In pooled mode (`use_pools`) the Faker values behind each payload (names,
+    dishes, ingredients, sentences, phones, CNPJs, ...) are generated in
+    batches and served from ring buffers, so building a payload under load
+    costs a few list lookups instead of many provider calls. Values repeat
+    across the ring; fields that must be unique (emails, company names) keep
+    their unique suffix.
+
+    A generator is unseeded by default. `reseed` makes its output a pure
+    function of a run seed and a stream key (a worker or iteration), and its
+    unique suffixes '<seed tag>-<stream>-<counter>', so distinct streams
+    never collide and replaying a seed sends the same payloads.
+
+    Which products an order contains, and how many, follows
+    `product_popularity` (Zipf over the listing order) and `order_sizes`.
     """
-    def __init__(self, locale: str = FAKER_LOCALE):
+    def __init__(
+        self,
+        locale: str = FAKER_LOCALE,
+        pooled: bool = DATA_POOL_ENABLED,
+        pool_size: int = DATA_POOL_SIZE,
+        background_refill: bool = DATA_POOL_BACKGROUND_REFILL,
+        seed: Optional[int] = None,
+        stream: str = "main",
+    ):
         """
         Initializes the Faker instance and adds the custom provider.
         """
-        self.faker = Faker(locale)
+        # Faker is imported on first use: it is the slowest import of the
+        # harness and commands such as 'list-stories' never generate data.
+        from faker import Faker
+
+        from data_test.core.faker_providers import PtBrPhoneProvider
+
+        self.faker = Faker(locale, providers=list(FAKER_PROVIDERS))
         self.faker.add_provider(PtBrPhoneProvider)
         try:
             from faker.providers.food import Provider as FoodProvider
             self.faker.add_provider(FoodProvider)
         except ImportError:
             logging.warning("faker.providers.food not available; using fallback food data.")
+        self.pools: Optional[DataPools] = None
+        if pooled:
+            self.use_pools(pool_size, background_refill)
+        self.product_popularity = ZipfPopularity(PRODUCT_ZIPF_EXPONENT)
+        self.order_sizes: OrderSizes = ORDER_SIZES[ORDER_SIZE_DISTRIBUTION]
+        self.reseed(seed, stream)
+
+    def reseed(self, seed: Optional[int], stream: str = "main"):
+        """
+        Restarts the generator on the stream `stream` of run seed `seed`.
+
+        With `seed=None` the Faker output stays random and unique suffixes
+        get a random per-generator tag instead.
+        """
+        self.seed = seed
+        self.faker.unique.clear()
+        if seed is None:
+            self._suffix_prefix = f"{secrets.token_hex(4)}-"
+        else:
+            self.faker.seed_instance(derive_seed(seed, stream))
+            self._suffix_prefix = f"{derive_seed(seed, 'tag'):016x}"[:8] + f"-{stream}-"
+        # next() on itertools.count is atomic, so threads sharing the
+        # generator still get distinct suffixes.
+        self._unique_counter = itertools.count(1)
+
+    def unique_suffix(self) -> str:
+        """Returns a suffix never returned before by this generator or any other stream of the same seed."""
+        return f"{self._suffix_prefix}{next(self._unique_counter)}"
+
+    def adopt_settings(self, other: "DataGenerator"):
+        """Uses the workload distributions of `other`."""
+        self.product_popularity = other.product_popularity
+        self.order_sizes = other.order_sizes
+
+    def _batch_seed(self) -> int:
+        """Seed of the next batch generation, drawn from the Faker stream."""
+        return self.faker.random.getrandbits(63)
+
+    def use_pools(self, size: int = DATA_POOL_SIZE, background_refill: bool = DATA_POOL_BACKGROUND_REFILL):
+        """Switches to pooled generation; each pool is filled on its first draw."""
+        self.pools = DataPools(size, background_refill)
+
+    def _draw(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        batch_factory: Optional[Callable[[int], List[Any]]] = None,
+    ) -> Any:
+        """Returns a value from the pool `name`, or a fresh one from `factory` when pooling is off."""
+        if self.pools is None:
+            return factory()
+        return self.pools.draw(name, factory, batch_factory)
+
+    def generate_phones(self, count: int) -> List[str]:
+        """Generates `count` mobile numbers in one batch."""
+        return generate_phones(count, self._batch_seed())
+
+    def generate_cnpjs(self, count: int) -> List[str]:
+        """Generates `count` CNPJs with valid check digits in one batch."""
+        return generate_cnpjs(count, self._batch_seed())
+
+    def generate_prices(self, count: int) -> List[str]:
+        """Generates `count` product prices in one batch."""
+        return generate_prices(count, self._batch_seed())
+
+    def _sentence(self, nb_words: int) -> str:
+        return self._draw(f"sentence_{nb_words}", lambda: self.faker.sentence(nb_words=nb_words))
+
+    def _person_name(self) -> str:
+        return self._draw("name", self.faker.name)
+
+    def _phone(self) -> str:
+        return self._draw("phone", self.faker.pt_br_cellphone, self.generate_phones)
+
+    def _price(self) -> str:
+        return self._draw(
+            "price",
+            lambda: str(self.faker.pydecimal(left_digits=2, right_digits=2, positive=True, min_value=1, max_value=99)),
+            self.generate_prices,
+        )
 
     def _food_dish(self) -> str:
+        return self._draw("dish", self._new_food_dish)
+
+    def _new_food_dish(self) -> str:
         try:
             name = self.faker.food.dish()
         except AttributeError:
@@ -70,6 +193,9 @@ class DataGenerator:
         return name[:100]
 
     def _food_ingredient(self) -> str:
+        return self._draw("ingredient", self._new_food_ingredient)
+
+    def _new_food_ingredient(self) -> str:
         try:
             return self.faker.food.ingredient()
         except AttributeError:
@@ -77,26 +203,45 @@ class DataGenerator:
 
     def generate_user_data(self) -> Dict[str, Any]:
         """Generates data for a new user registration."""
-        name = self.faker.name()
-        email = generate_unique_email(name)
-        password = self.faker.password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True)
+        name = self._person_name()
+        email = generate_unique_email(name, self.unique_suffix())
+        password = self._draw(
+            "password",
+            lambda: self.faker.password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True),
+        )
         return {
             "name": name,
             "email": email,
-            "phone": self.faker.pt_br_cellphone(),
+            "phone": self._phone(),
             "password": password,
             "passwordConfirmation": password
         }
 
+    def generate_pool_user(self, role: str) -> Dict[str, str]:
+        """Generates the credentials of a user for the pre-provisioned user pool."""
+        user_data = self.generate_user_data()
+        return {
+            "role": role,
+            "username": user_data["email"],
+            "password": user_data["password"],
+            "email": user_data["email"],
+            "name": user_data["name"],
+        }
+
     def generate_company_data(self) -> Dict[str, Any]:
         """Generates data for a new company."""
-        name = self._sanitize_company_name(self.faker.unique.company() + str(uuid.uuid4()))
+        if self.pools is None:
+            company = self.faker.unique.company()
+        else:
+            company = self._draw("company", self.faker.company)
+        suffix = self.unique_suffix()
+        name = self._sanitize_company_name(f"{company} {suffix}")
         return {
             "name": name,
-            "email": generate_unique_email(name),
-            "phone": self.faker.pt_br_cellphone(),
-            "cnpj": self.faker.cnpj(), # Use faker's cnpj generator for pt_BR locale
-            "description": self.faker.catch_phrase(),
+            "email": generate_unique_email(self._sanitize_company_name(company), suffix),
+            "phone": self._phone(),
+            "cnpj": self._draw("cnpj", self.faker.cnpj, self.generate_cnpjs), # Use faker's cnpj generator for pt_BR locale
+            "description": self._draw("catch_phrase", self.faker.catch_phrase),
             "type": "RESTAURANT",
         }
 
@@ -112,8 +257,8 @@ class DataGenerator:
         """Generates data for a new product."""
         return {
             "name": self._food_dish(),
-            "price": str(self.faker.pydecimal(left_digits=2, right_digits=2, positive=True, min_value=1, max_value=99)),
-            "description": self.faker.sentence(nb_words=10),
+            "price": self._price(),
+            "description": self._sentence(10),
             "ingredients": [self._food_ingredient() for _ in range(3)],
             "servesPersons": self.faker.random_int(min=1, max=4),
             "companyId": company_id,
@@ -126,7 +271,7 @@ class DataGenerator:
         return {
             "name": name,
             "numPeople": self.faker.random_int(min=2, max=8),
-            "description": f"Mesa com vista para {self.faker.street_name()}",
+            "description": f"Mesa com vista para {self._draw('street', self.faker.street_name)}",
             "companyId": company_id,
         }
 
@@ -135,7 +280,7 @@ class DataGenerator:
         return {
             "name": f"Mesa Atualizada {self.faker.random_int(min=1, max=9)}",
             "numPeople": self.faker.random_int(min=2, max=10),
-            "description": self.faker.sentence(nb_words=6),
+            "description": self._sentence(6),
         }
 
     def generate_table_bulk_data(
@@ -152,7 +297,7 @@ class DataGenerator:
             "start": start,
             "end": end,
             "numPeople": num_people,
-            "description": description or self.faker.sentence(nb_words=6),
+            "description": description or self._sentence(6),
         }
 
     def generate_employee_invite_data(self, company_id: str, role_id: str, email: str) -> Dict[str, Any]:
@@ -166,7 +311,7 @@ class DataGenerator:
     def generate_command_data(self, table_id: str, employee_id: str) -> Dict[str, Any]:
         """Generates data for a new command."""
         return {
-            "name": self.faker.name(),
+            "name": self._person_name(),
             "numberOfPeople": self.faker.random_int(min=1, max=10),
             "tableId": table_id,
             "employeeId": employee_id,
@@ -174,15 +319,24 @@ class DataGenerator:
 
     def generate_order_data(self, command_id: str, product_ids: List[str]) -> Dict[str, Any]:
         """Generates data for a new order with multiple items."""
-        items = [{"productId": pid, "notes": self.faker.sentence(nb_words=5)} for pid in product_ids]
+        items = [{"productId": pid, "notes": self._sentence(5)} for pid in product_ids]
         return {
             "commandId": command_id,
             "items": items,
         }
 
+    def pick_products(self, product_ids: List[str], count: Optional[int] = None) -> List[str]:
+        """
+        Picks the products of one order: `count` (by default drawn from
+        `order_sizes`) distinct IDs, favouring the first ones of the list.
+        """
+        if count is None:
+            count = self.order_sizes.sample(self.faker.random)
+        return self.product_popularity.pick(product_ids, count, self.faker.random)
+
     def generate_order_notes(self, count: int) -> List[str]:
         """Generates a list of order notes."""
-        return [self.faker.sentence(nb_words=5) for _ in range(count)]
+        return [self._sentence(5) for _ in range(count)]
 
     def generate_order_form(
         self,
@@ -203,12 +357,83 @@ class DataGenerator:
         """Generates data for updating a product."""
         return {
             "name": f"{self._food_dish()} Atualizado",
-            "price": str(self.faker.pydecimal(left_digits=2, right_digits=2, positive=True, min_value=1, max_value=99)),
-            "description": self.faker.sentence(nb_words=8),
+            "price": self._price(),
+            "description": self._sentence(8),
             "companyId": company_id,
             "categoryId": category_id,
             "availability": True,
         }
 
+# Generator of the worker stream the current thread or task runs in.
+_current_generator: ContextVar[Optional[DataGenerator]] = ContextVar("current_data_generator", default=None)
+
+
+class DataGeneratorProxy:
+    """
+    The module-level `data_generator`.
+
+    Attribute access is forwarded to the generator of the current worker
+    stream (see `stream`) or, outside any stream, to `default`, which is
+    only built on first use. Stories keep
+    calling `data_generator.generate_...` and get per-worker seeded data
+    when the run has a seed.
+    """
+
+    def __init__(self):
+        self._default: Optional[DataGenerator] = None
+        self.seed: Optional[int] = None
+        self.process_index = 0
+        self._idle: List[DataGenerator] = []
+        self._lock = threading.Lock()
+
+    @property
+    def default(self) -> DataGenerator:
+        """The generator used outside streams, built on first use."""
+        if self._default is None:
+            with self._lock:
+                if self._default is None:
+                    self._default = DataGenerator()
+        return self._default
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_current_generator.get() or self.default, name)
+
+    def set_seed(self, seed: Optional[int], process_index: int = 0):
+        """
+        Seeds the run; `process_index` must differ between processes sharing a seed.
+        """
+        self.seed = seed
+        self.process_index = process_index
+        self.default.reseed(seed, f"p{process_index}")
+
+    @contextmanager
+    def stream(self, key: Any) -> Iterator[DataGenerator]:
+        """
+        Runs the block with a generator seeded for stream `key` (a worker or iteration).
+
+        Unseeded runs share the default generator. Seeded streams reuse
+        idle generators, so entering one costs a reseed, not a new Faker;
+        workload distributions are those of the default generator. Seeded
+        streams never draw from data pools: a pool's cursor is shared by every
+        stream, so which value an iteration got would depend on scheduling.
+        """
+        if self.seed is None:
+            yield self.default
+            return
+        with self._lock:
+            generator = self._idle.pop() if self._idle else None
+        if generator is None:
+            generator = DataGenerator(pooled=False)
+        generator.adopt_settings(self.default)
+        generator.reseed(self.seed, f"p{self.process_index}{key}")
+        token = _current_generator.set(generator)
+        try:
+            yield generator
+        finally:
+            _current_generator.reset(token)
+            with self._lock:
+                self._idle.append(generator)
+
+
 # --- Singleton Instance ---
-data_generator = DataGenerator()
+data_generator = DataGeneratorProxy()
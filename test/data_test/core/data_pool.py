@@ -0,0 +1,109 @@
+"""
+Ring buffers of pre-generated fake values.
+
+Faker providers are slow compared to the rest of a request, and under load
+the harness can spend a noticeable share of its CPU building names and
+sentences. A `ValuePool` calls its factory once per slot, in one batch, and
+then serves values by index, so drawing a value is a counter increment and
+a list lookup. Without background refill the buffer is filled once and
+reused round-robin; with it, a daemon thread generates the next batch while
+the current one is being served and swaps it in after a full lap. Pools
+of values that have a batch generator (see `data_test.core.batch_data`)
+are filled with one call to it instead.
+"""
+import itertools
+import logging
+import threading
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ValuePool(Generic[T]):
+    """
+    Fixed-size ring buffer filled by calling `factory` in batches, or by one
+    call to `batch_factory(size)` when given.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        size: int,
+        background_refill: bool = False,
+        batch_factory: Optional[Callable[[int], List[T]]] = None,
+    ):
+        self.factory = factory
+        self.batch_factory = batch_factory
+        self.size = max(1, size)
+        self.background_refill = background_refill
+        self._values: List[T] = self._batch()
+        # next() on itertools.count is atomic under the GIL, so concurrent
+        # virtual users can draw without taking a lock.
+        self._counter = itertools.count()
+        self._lap_end = self.size
+        self.refills = 0
+        self._refill_requested = threading.Event()
+        self._refiller: Optional[threading.Thread] = None
+        if background_refill:
+            self._refiller = threading.Thread(target=self._refill_loop, name="data-pool-refill", daemon=True)
+            self._refiller.start()
+
+    def _batch(self) -> List[T]:
+        if self.batch_factory is not None:
+            return self.batch_factory(self.size)
+        return [self.factory() for _ in range(self.size)]
+
+    def next(self) -> T:
+        """Returns the next value of the ring."""
+        index = next(self._counter)
+        if self._refiller is not None and index >= self._lap_end and not self._refill_requested.is_set():
+            self._refill_requested.set()
+        return self._values[index % self.size]
+
+    def _refill_loop(self):
+        """Generates a fresh batch each time the current one has been fully served."""
+        while True:
+            self._refill_requested.wait()
+            try:
+                values = self._batch()
+            except Exception as e:
+                logging.error(f"Data pool refill failed: {e}")
+                values = None
+            if values is not None:
+                self._values = values
+                self.refills += 1
+            self._lap_end = next(self._counter) + self.size
+            self._refill_requested.clear()
+
+
+class DataPools:
+    """
+    Named `ValuePool`s, created on first use with the same size and refill mode.
+    """
+
+    def __init__(self, size: int, background_refill: bool = False):
+        self.size = size
+        self.background_refill = background_refill
+        self._pools: Dict[str, ValuePool] = {}
+        self._lock = threading.Lock()
+
+    def draw(
+        self,
+        name: str,
+        factory: Callable[[], T],
+        batch_factory: Optional[Callable[[int], List[T]]] = None,
+    ) -> T:
+        """Returns the next value of the pool `name`, filling it from `factory` on first use."""
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(name)
+                if pool is None:
+                    pool = self._pools[name] = ValuePool(
+                        factory, self.size, self.background_refill, batch_factory
+                    )
+        return pool.next()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the size and number of background refills of each pool."""
+        return {name: {"size": pool.size, "refills": pool.refills} for name, pool in sorted(self._pools.items())}
@@ -0,0 +1,200 @@
+"""
+Offline generator of a synthetic restaurant dataset for bulk seeding.
+
+Creating a large world through the API takes hours, so `dataset generate`
+writes one straight to disk instead: categories, companies, employees,
+products, tables, commands, orders and order items, as sharded JSONL or CSV
+files meant to be loaded into a local database (e.g. with Postgres `COPY`).
+
+The world is generated one company at a time and every row is written as
+soon as it is built, so memory use depends on the size of one company, not
+on the size of the dataset. Every row has a UUID `id`, and foreign keys
+(`companyId`, `tableId`, `employeeId`, `commandId`, `productId`,
+`categoryId`) always point at rows of the same dataset and, except for
+categories, of the same company. With a seed the output is identical on
+every run.
+"""
+import csv
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+from data_test.core.batch_data import cnpj_for
+from data_test.core.data_generator import DataGenerator, derive_seed
+from data_test.core.distributions import ZipfPopularity
+
+FORMATS = ("jsonl", "csv")
+
+# Product categories shared by every company.
+CATEGORY_NAMES = (
+    "Entradas", "Pratos Principais", "Massas", "Pizzas", "Lanches",
+    "Saladas", "Sobremesas", "Bebidas", "Bebidas Alcoólicas", "Cafés",
+)
+
+# Columns of each entity, in file order (also the CSV header).
+ENTITY_FIELDS: Dict[str, tuple] = {
+    "categories": ("id", "name"),
+    "companies": ("id", "name", "email", "phone", "cnpj", "description", "type"),
+    "employees": ("id", "companyId", "role", "name", "email", "phone"),
+    "products": (
+        "id", "companyId", "categoryId", "name", "price", "description",
+        "ingredients", "servesPersons", "availability",
+    ),
+    "tables": ("id", "companyId", "name", "numPeople", "description"),
+    "commands": ("id", "companyId", "tableId", "employeeId", "name", "numberOfPeople"),
+    "orders": ("id", "companyId", "commandId"),
+    "order_items": ("id", "orderId", "productId", "notes"),
+}
+
+
+@dataclass
+class DatasetShape:
+    """Number of companies and of rows generated per company (or per parent row)."""
+    companies: int = 1000
+    waiters_per_company: int = 3
+    products_per_company: int = 20
+    tables_per_company: int = 10
+    commands_per_table: int = 5
+    orders_per_command: int = 3
+    items_per_order: int = 3
+
+
+class ShardedWriter:
+    """
+    Writes the rows of one entity to `<directory>/<entity>/part-NNNNN.<format>`,
+    starting a new shard every `shard_size` rows.
+    """
+
+    def __init__(self, directory: Path, entity: str, fmt: str, shard_size: int):
+        self.directory = directory / entity
+        self.entity = entity
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.fields = ENTITY_FIELDS[entity]
+        self.rows = 0
+        self.shards: List[str] = []
+        self._file: Optional[TextIO] = None
+        self._csv: Optional[csv.writer] = None
+
+    def _open_shard(self):
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"part-{len(self.shards):05d}.{self.fmt}"
+        self._file = path.open("w", encoding="utf-8", newline="")
+        self.shards.append(str(path.relative_to(self.directory.parent)))
+        if self.fmt == "csv":
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.fields)
+
+    def write(self, row: Dict[str, Any]):
+        if self.rows % self.shard_size == 0:
+            self._open_shard()
+        if self.fmt == "csv":
+            # Lists (product ingredients) go into one cell as JSON.
+            self._csv.writerow([
+                json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+                for value in (row[field] for field in self.fields)
+            ])
+        else:
+            self._file.write(json.dumps({field: row[field] for field in self.fields}, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._csv = None
+
+
+def write_dataset(
+    output: Path,
+    shape: DatasetShape,
+    fmt: str = "jsonl",
+    shard_size: int = 100_000,
+    seed: Optional[int] = None,
+    product_skew: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Streams a synthetic world with `shape` to `output` and returns the rows written per entity.
+
+    A `manifest.json` next to the entity directories lists the shards, the
+    columns, the shape and the seed. Names and free-text fields come from
+    the generator's data pools (see `DataGenerator.use_pools`), so they
+    repeat across the dataset; emails and CNPJs are unique. The items of an
+    order are distinct products picked by `DataGenerator.pick_products`,
+    with Zipf exponent `product_skew` (default `PRODUCT_ZIPF_EXPONENT`).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown dataset format '{fmt}'; expected one of {', '.join(FORMATS)}.")
+    generator = DataGenerator(pooled=True, background_refill=False, seed=seed, stream="dataset")
+    if product_skew is not None:
+        generator.product_popularity = ZipfPopularity(product_skew)
+    faker = generator.faker
+    # Consecutive CNPJ roots from a random start, so CNPJs never repeat.
+    cnpj_offset = derive_seed(seed, "cnpj") % 10 ** 8 if seed is not None else faker.random.randrange(10 ** 8)
+
+    output.mkdir(parents=True, exist_ok=True)
+    writers = {entity: ShardedWriter(output, entity, fmt, shard_size) for entity in ENTITY_FIELDS}
+    try:
+        category_ids = []
+        for name in CATEGORY_NAMES:
+            category_ids.append(faker.uuid4())
+            writers["categories"].write({"id": category_ids[-1], "name": name})
+
+        for company_number in range(shape.companies):
+            company_id = faker.uuid4()
+            company = generator.generate_company_data()
+            company.update(id=company_id, cnpj=cnpj_for(cnpj_offset + company_number))
+            writers["companies"].write(company)
+
+            waiter_ids = []
+            for role in ["OWNER"] + ["WAITER"] * shape.waiters_per_company:
+                user = generator.generate_user_data()
+                employee = {"id": faker.uuid4(), "companyId": company_id, "role": role, **user}
+                writers["employees"].write(employee)
+                if role == "WAITER":
+                    waiter_ids.append(employee["id"])
+
+            product_ids = []
+            for _ in range(shape.products_per_company):
+                product = generator.generate_product_data(company_id, faker.random_element(category_ids))
+                product["id"] = faker.uuid4()
+                writers["products"].write(product)
+                product_ids.append(product["id"])
+
+            for table_number in range(1, shape.tables_per_company + 1):
+                table = generator.generate_table_data(company_id, f"Mesa {table_number}")
+                table["id"] = faker.uuid4()
+                writers["tables"].write(table)
+                if not waiter_ids:
+                    continue
+                for _ in range(shape.commands_per_table):
+                    command = generator.generate_command_data(table["id"], faker.random_element(waiter_ids))
+                    command.update(id=faker.uuid4(), companyId=company_id)
+                    writers["commands"].write(command)
+                    if not product_ids:
+                        continue
+                    for _ in range(shape.orders_per_command):
+                        order_id = faker.uuid4()
+                        writers["orders"].write({"id": order_id, "companyId": company_id, "commandId": command["id"]})
+                        items = generator.pick_products(product_ids, shape.items_per_order)
+                        for item in generator.generate_order_form(command["id"], items)["items"]:
+                            writers["order_items"].write({"id": faker.uuid4(), "orderId": order_id, **item})
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    counts = {entity: writer.rows for entity, writer in writers.items()}
+    manifest = {
+        "format": fmt,
+        "seed": seed,
+        "shape": asdict(shape),
+        "product_skew": generator.product_popularity.exponent,
+        "entities": {
+            entity: {"rows": writer.rows, "columns": list(writer.fields), "shards": writer.shards}
+            for entity, writer in writers.items()
+        },
+    }
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return counts
@@ -0,0 +1,168 @@
+"""
+Workload distributions: product popularity, order sizes and arrival curves.
+
+Real restaurants do not order every dish equally, nor receive customers at
+a steady pace: a few best sellers take most orders and traffic peaks at
+lunch and dinner. These shapes stress caches and hot rows very differently
+from uniform picks at a constant rate, so the data generator and the
+open-loop runner can draw from them:
+
+- `ZipfPopularity` ranks items by position; the item of rank r is picked
+  with weight 1/r^s (s=0 is uniform).
+- `OrderSizes` draws the number of items of an order from a discrete
+  distribution.
+- `ArrivalCurve` scales the open-loop arrival rate by the simulated time of
+  day; `arrival_offsets` turns a peak rate and a curve into start times.
+
+Named order sizes and arrival curves live in `ORDER_SIZES` and
+`ARRIVAL_CURVES`; `register_order_sizes` and `register_arrival_curve` add
+new ones.
+"""
+import bisect
+import heapq
+import random
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+SECONDS_PER_DAY = 86400.0
+
+
+@lru_cache(maxsize=256)
+def _zipf_weights(count: int, exponent: float) -> Tuple[float, ...]:
+    return tuple(1.0 / rank ** exponent for rank in range(1, count + 1))
+
+
+class ZipfPopularity:
+    """
+    Picks items with probability proportional to 1/rank^exponent, rank 1 being the first item.
+    """
+
+    def __init__(self, exponent: float = 1.0):
+        if exponent < 0:
+            raise ValueError("Zipf exponent must be zero or positive.")
+        self.exponent = exponent
+
+    def pick(self, items: Sequence[T], count: int, rng: random.Random) -> List[T]:
+        """
+        Picks `count` distinct items (all of them when there are fewer).
+
+        Uses weighted sampling without replacement (Efraimidis-Spirakis):
+        each item gets the key u^(1/weight) and the largest keys win.
+        """
+        if count >= len(items):
+            return list(items)
+        weights = _zipf_weights(len(items), self.exponent)
+        keyed = ((rng.random() ** (1.0 / weight), index) for index, weight in enumerate(weights))
+        return [items[index] for _, index in heapq.nlargest(count, keyed)]
+
+    def __repr__(self) -> str:
+        return f"ZipfPopularity(exponent={self.exponent:g})"
+
+
+class OrderSizes:
+    """
+    Discrete distribution of the number of items in an order.
+    """
+
+    def __init__(self, weights: Dict[int, float]):
+        if not weights or any(size < 1 or weight < 0 for size, weight in weights.items()):
+            raise ValueError("Order sizes must be positive and weights non-negative.")
+        self.sizes = sorted(weights)
+        self._cumulative = []
+        total = 0.0
+        for size in self.sizes:
+            total += weights[size]
+            self._cumulative.append(total)
+        if total <= 0:
+            raise ValueError("Order size weights must not all be zero.")
+
+    def sample(self, rng: random.Random) -> int:
+        """Draws one order size."""
+        return self.sizes[bisect.bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+
+
+class ArrivalCurve:
+    """
+    Arrival-rate multiplier by hour of day, interpolated linearly between
+    `(hour, multiplier)` points and wrapping around midnight.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        points = sorted(points)
+        if not points or any(not 0 <= hour < 24 or multiplier <= 0 for hour, multiplier in points):
+            raise ValueError("Arrival curve points need hours in [0, 24) and positive multipliers.")
+        first_hour, first_multiplier = points[0]
+        self.points = points
+        # Close the cycle so hours after the last point interpolate back to the first.
+        self._hours = [hour for hour, _ in points] + [first_hour + 24]
+        self._multipliers = [multiplier for _, multiplier in points] + [first_multiplier]
+
+    def multiplier(self, hour: float) -> float:
+        """Returns the rate multiplier at `hour` (any real number; taken modulo 24)."""
+        hour %= 24
+        if hour < self._hours[0]:
+            hour += 24
+        index = bisect.bisect_right(self._hours, hour) - 1
+        start, end = self._hours[index], self._hours[index + 1]
+        low, high = self._multipliers[index], self._multipliers[index + 1]
+        return low + (high - low) * (hour - start) / (end - start)
+
+
+ORDER_SIZES: Dict[str, OrderSizes] = {}
+ARRIVAL_CURVES: Dict[str, Optional[ArrivalCurve]] = {}
+
+
+def register_order_sizes(name: str, weights: Dict[int, float]) -> OrderSizes:
+    """Adds a named order-size distribution."""
+    ORDER_SIZES[name] = OrderSizes(weights)
+    return ORDER_SIZES[name]
+
+
+def register_arrival_curve(name: str, points: Sequence[Tuple[float, float]]) -> ArrivalCurve:
+    """Adds a named arrival curve."""
+    ARRIVAL_CURVES[name] = ArrivalCurve(points)
+    return ARRIVAL_CURVES[name]
+
+
+register_order_sizes("single", {1: 1})
+# Mostly one to three dishes per round, with a tail of group orders.
+register_order_sizes("restaurant", {1: 0.30, 2: 0.30, 3: 0.18, 4: 0.12, 5: 0.06, 6: 0.04})
+
+# Constant rate.
+ARRIVAL_CURVES["flat"] = None
+# Quiet nights, a lunch peak at 12:30 and a slightly lower dinner peak at 20:00.
+register_arrival_curve("restaurant", [
+    (0, 0.05), (6, 0.05), (8, 0.15), (11, 0.5), (12.5, 1.0), (14, 0.5),
+    (15.5, 0.2), (18, 0.4), (20, 0.9), (21.5, 0.6), (23, 0.15),
+])
+
+
+def arrival_offsets(
+    rate: float,
+    duration: float,
+    curve: Optional[ArrivalCurve] = None,
+    day_length: float = SECONDS_PER_DAY,
+    start_hour: float = 0.0,
+) -> Iterator[float]:
+    """
+    Yields the start offsets (seconds from the beginning of the run) of open-loop arrivals.
+
+    Without a curve arrivals are evenly spaced at `rate` per second. With
+    one, `rate` is the rate at multiplier 1 (the peak of the built-in
+    curves) and each gap is 1 / (rate * multiplier) at the simulated time of
+    day. The simulated clock starts at `start_hour` and runs a full day in
+    `day_length` seconds, so a short run can cover the lunch and dinner peaks.
+    """
+    if curve is None:
+        index = 0
+        while index / rate < duration:
+            yield index / rate
+            index += 1
+        return
+    offset = 0.0
+    while offset < duration:
+        yield offset
+        hour = start_hour + 24 * offset / day_length
+        offset += 1.0 / (rate * curve.multiplier(hour))
@@ -0,0 +1,22 @@
+"""
+Custom Faker providers.
+
+Kept apart from `data_test.core.data_generator` so that importing the
+generator does not import Faker; this module is loaded when the first
+`DataGenerator` is built.
+"""
+from faker.providers import BaseProvider
+
+from data_test.core.batch_data import AREA_CODES
+
+# --- Custom Provider for Brazilian Phone Numbers ---
+
+class PtBrPhoneProvider(BaseProvider):
+    """
+    A Faker provider for generating Brazilian phone numbers in the common
+    format (XX) 9XXXX-XXXX.
+    """
+    def pt_br_cellphone(self) -> str:
+        """Generates a random Brazilian mobile phone number."""
+        area_code = self.random_element(elements=AREA_CODES)
+        return f"({area_code}) 9{self.random_int(7000, 9999)}-{self.random_int(0, 9999):04d}"
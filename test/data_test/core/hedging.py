@@ -0,0 +1,202 @@
+"""
+Hedged requests for idempotent reads.
+
+A hedging client sends a read and, if no answer has arrived after a delay,
+sends the same request again and keeps whichever response comes back first.
+The delay is a latency percentile of the route (p95 by default), so only the
+slowest few percent of requests are duplicated. It is taken from the
+latencies of first attempts only, which the policy records itself, even
+when the hedge wins: the reported metrics hold the hedged (faster)
+response, and deriving the delay from them would lower the percentile with
+every hedge and hedge ever more requests. This trims the tail at the cost of some extra load, and
+`HedgingPolicy.stats` measures both sides: how many hedges were sent,
+how many of them answered first, and the share of extra requests.
+
+Hedging is opt-in (`ApiClient(hedging=HedgingPolicy())`,
+`AsyncApiClient(hedging=...)` or `run --hedge-percentile`) and only applies
+to GET routes of the registry. The blocking client sends its attempts on a
+thread pool (`send`), the asyncio client as tasks (`send_async`).
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+
+from data_test.core.config import HEDGE_DEFAULT_DELAY_SECONDS, HEDGE_MAX_WORKERS, HEDGE_MIN_SAMPLES
+from data_test.core.metrics import LatencyHistogram
+from data_test.core.routes import Route
+
+# Route percentiles are recomputed at most this often.
+DELAY_REFRESH_SECONDS = 1.0
+
+
+class HedgingPolicy:
+    """
+    Sends a duplicate GET when the first attempt is slower than a route percentile.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        default_delay: float = HEDGE_DEFAULT_DELAY_SECONDS,
+        max_workers: int = HEDGE_MAX_WORKERS,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._delays: Dict[str, Tuple[float, float]] = {}
+        # Latency of first attempts per route, hedged or not.
+        self._primary: Dict[str, LatencyHistogram] = {}
+        # Losing async attempts, referenced until they finish.
+        self._background: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def applies_to(self, route: Route) -> bool:
+        return route.method == "GET"
+
+    def delay(self, route: Route) -> float:
+        """Returns how long to wait for the first attempt before hedging."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._delays.get(route.key)
+        if cached and cached[0] > now:
+            return cached[1]
+        with self._lock:
+            primary = self._primary.get(route.key)
+            if primary is not None and primary.count >= self.min_samples:
+                delay = primary.percentile(self.percentile)
+            else:
+                delay = self.default_delay
+            self._delays[route.key] = (now + DELAY_REFRESH_SECONDS, delay)
+        return delay
+
+    def _record_primary(self, route: Route, seconds: float):
+        """Records the latency of a first attempt."""
+        with self._lock:
+            histogram = self._primary.get(route.key)
+            if histogram is None:
+                histogram = self._primary[route.key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def send(self, route: Route, attempt: Callable[[], Any]) -> Any:
+        """
+        Runs `attempt`, and a second copy of it if the first is slow.
+
+        Returns the result of the first attempt to succeed; raises the last
+        error when both fail. The losing attempt is left to finish in the
+        background and its result is discarded.
+
+        The hedge delay and the recorded first-attempt latency start when the
+        attempt starts running, so time spent waiting for a pool thread
+        (more concurrent callers than `max_workers`) does not trigger hedges.
+        """
+        self._count("requests")
+        started = threading.Event()
+        start = 0.0
+
+        def first_attempt():
+            nonlocal start
+            start = time.perf_counter()
+            started.set()
+            try:
+                return attempt()
+            finally:
+                # Recorded when the first attempt ends, also after a hedge has won.
+                self._record_primary(route, time.perf_counter() - start)
+
+        first = self._executor.submit(first_attempt)
+        started.wait()
+        try:
+            return first.result(timeout=max(0.0, self.delay(route) - (time.perf_counter() - start)))
+        except FutureTimeoutError:
+            pass
+
+        self._count("hedges_sent")
+        hedge = self._executor.submit(attempt)
+        pending = {first, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    self._count("hedges_won")
+                return result
+        raise error
+
+    async def send_async(self, route: Route, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asyncio counterpart of `send`: awaits `attempt()`, and a second copy if the first is slow.
+        """
+        self._count("requests")
+        start = time.perf_counter()
+        first = asyncio.ensure_future(attempt())
+        first.add_done_callback(lambda _: self._record_primary(route, time.perf_counter() - start))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay(route))
+            if done:
+                return first.result()
+
+            self._count("hedges_sent")
+            hedge = asyncio.ensure_future(attempt())
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    if task is hedge:
+                        self._count("hedges_won")
+                    return result
+            raise error
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            pending = set()
+            raise
+        finally:
+            for task in pending:
+                self._detach(task)
+
+    def _detach(self, task: asyncio.Task):
+        """Lets a losing attempt finish in the background and discards its outcome."""
+        self._background.add(task)
+
+        def discard(finished: asyncio.Task):
+            self._background.discard(finished)
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hedging counters and the extra load they caused."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges_sent": self.hedges_sent,
+                "hedges_won": self.hedges_won,
+                "win_ratio": self.hedges_won / self.hedges_sent if self.hedges_sent else 0.0,
+                # Each hedge is one extra request to the backend.
+                "overhead": self.hedges_sent / self.requests if self.requests else 0.0,
+            }
@@ -0,0 +1,290 @@
+"""
+Instrumented connection pooling for the blocking `ApiClient`.
+
+The default `requests.Session` keeps only 10 connections per host, so under
+concurrency connections are opened, discarded and re-opened without any
+trace. `create_session` builds a session whose pool size, blocking mode and
+keep-alive are configurable, and whose urllib3 pools count what they do:
+
+- new connections: TCP (and TLS) connections opened;
+- reused connections: requests served by an already open connection;
+- pool waits: requests that found every connection in use and had to wait
+  (blocking pools) or open an extra, short-lived one (non-blocking pools);
+- discarded connections: connections closed because the pool was full.
+
+Many new or discarded connections mean the latency includes our own
+connection churn rather than only the backend's response time.
+
+The pools also open their connections through timed connection classes.
+When the caller puts a dict in the `connection_phases` context variable
+(ApiClient does so when phase timing is on), a connection opened for that
+request stores its DNS, TCP connect and TLS handshake durations in it.
+`phase_trace` gives the asyncio client the same breakdown through httpx's
+'trace' request extension.
+
+`create_http2_client` is the HTTP/2 alternative: an `httpx.Client` that
+multiplexes concurrent requests as streams over a few connections. It
+needs the optional 'h2' package (`pip install data-test[http2]`) and keeps
+the same counters, except pool waits, which httpx does not expose.
+"""
+import logging
+import socket
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+from data_test.core.config import HTTP_KEEP_ALIVE, HTTP_POOL_BLOCK, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+HttpSession = Union[requests.Session, httpx.Client]
+
+
+class PoolStats:
+    """
+    Thread-safe connection pool counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.new_connections = 0
+        self.pool_waits = 0
+        self.wait_seconds = 0.0
+        self.discarded = 0
+
+    def add(self, counter: str, amount: float = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the counters, including the derived reuse figures."""
+        with self._lock:
+            reused = max(0, self.checkouts - self.new_connections)
+            return {
+                "requests": self.checkouts,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": reused / self.checkouts if self.checkouts else 0.0,
+                "pool_waits": self.pool_waits,
+                "wait_seconds": self.wait_seconds,
+                "discarded": self.discarded,
+            }
+
+
+# Phase durations (seconds) of the connection opened for the current request.
+connection_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("connection_phases", default=None)
+
+
+class _TimedConnectionMixin:
+    """Splits connection setup into DNS, TCP connect and TLS when phases are requested."""
+
+    def _new_conn(self):
+        phases = connection_phases.get()
+        if phases is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            # Let urllib3 resolve again and raise its own error.
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        phases["dns"] = resolved - start
+        # Connect to the address just resolved, so the connect phase excludes DNS.
+        # `_dns_host` is only used to open the socket; TLS still uses `host`.
+        dns_host = self._dns_host
+        self._dns_host = addresses[0][4][0]
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+            phases["connect"] = time.perf_counter() - resolved
+
+    def connect(self):
+        phases = connection_phases.get()
+        start = time.perf_counter()
+        super().connect()
+        if phases is not None and "connect" in phases and isinstance(self, HTTPSConnection):
+            phases["tls"] = max(0.0, time.perf_counter() - start - phases["dns"] - phases["connect"])
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+# httpcore trace steps ('<prefix>.<step>.started' / '.complete') timed as phases.
+_TRACED_PHASES = {"connect_tcp": "connect", "start_tls": "tls", "receive_response_body": "body"}
+
+
+def phase_trace(phases: Dict[str, float]) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+    """
+    Returns an httpx 'trace' extension for `AsyncClient` requests that fills `phases`.
+
+    httpcore resolves the host inside its TCP connect, so 'connect' includes
+    DNS and no 'dns' phase is recorded. 'ttfb' runs from sending the request
+    headers to receiving the response headers, like the blocking client's.
+    """
+    started: Dict[str, float] = {}
+
+    async def trace(event: str, info: Dict[str, Any]):
+        now = time.perf_counter()
+        step, _, edge = event.partition(".")[2].rpartition(".")
+        if edge == "started":
+            started[step] = now
+        elif edge == "complete" and step == "receive_response_headers" and "send_request_headers" in started:
+            phases["ttfb"] = now - started["send_request_headers"]
+        elif edge == "complete" and step in _TRACED_PHASES and step in started:
+            phases[_TRACED_PHASES[step]] = now - started[step]
+
+    return trace
+
+
+class _InstrumentedPoolMixin:
+    """Counts checkouts, new connections, waits and discards of a urllib3 pool."""
+
+    stats: PoolStats
+
+    def _new_conn(self):
+        self.stats.add("new_connections")
+        return super()._new_conn()
+
+    def _get_conn(self, timeout: Optional[float] = None):
+        self.stats.add("checkouts")
+        # The queue holds one slot (a connection or None) per allowed
+        # connection; an empty queue means every connection is in use.
+        if self.pool is None or not self.pool.empty():
+            return super()._get_conn(timeout)
+        self.stats.add("pool_waits")
+        start = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            self.stats.add("wait_seconds", time.perf_counter() - start)
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.stats.add("discarded")
+        super()._put_conn(conn)
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` whose per-host pools report to a shared `PoolStats`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.stats = PoolStats()
+        stats = self.stats
+        self._pool_classes = {
+            "http": type(
+                "InstrumentedHTTPConnectionPool",
+                (_InstrumentedPoolMixin, HTTPConnectionPool),
+                {"stats": stats, "ConnectionCls": TimedHTTPConnection},
+            ),
+            "https": type(
+                "InstrumentedHTTPSConnectionPool",
+                (_InstrumentedPoolMixin, HTTPSConnectionPool),
+                {"stats": stats, "ConnectionCls": TimedHTTPSConnection},
+            ),
+        }
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    pool_block: bool = HTTP_POOL_BLOCK,
+    keep_alive: bool = HTTP_KEEP_ALIVE,
+) -> requests.Session:
+    """
+    Builds a session with an instrumented pool of `pool_maxsize` connections per host.
+
+    `pool_connections` is the number of hosts whose pools are cached. With
+    `pool_block`, a request waits for a free connection instead of opening
+    one past the limit. Without `keep_alive`, every request asks the server
+    to close its connection, which is useful as a worst-case baseline.
+    """
+    session = requests.Session()
+    adapter = InstrumentedHTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def create_http2_client(
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    keep_alive: bool = HTTP_KEEP_ALIVE,
+    prior_knowledge: bool = False,
+) -> Optional[httpx.Client]:
+    """
+    Builds an HTTP/2 `httpx.Client`, or returns None when 'h2' is not installed.
+
+    Over https the protocol is negotiated with ALPN and falls back to
+    HTTP/1.1 if the server does not offer HTTP/2. Plain http has no
+    negotiation, so `prior_knowledge` must be set to speak HTTP/2 (h2c)
+    from the first byte.
+    """
+    stats = PoolStats()
+    # Weak references, so a closed connection's stream leaves the set instead
+    # of having its id() reused by the next one.
+    seen_streams: "weakref.WeakSet[Any]" = weakref.WeakSet()
+    seen_lock = threading.Lock()
+
+    def count_connection(response: httpx.Response):
+        stats.add("checkouts")
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        with seen_lock:
+            is_new = stream not in seen_streams
+            seen_streams.add(stream)
+        if is_new:
+            stats.add("new_connections")
+
+    limits = httpx.Limits(
+        max_connections=pool_maxsize,
+        max_keepalive_connections=pool_maxsize if keep_alive else 0,
+    )
+    try:
+        client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=limits,
+            event_hooks={"response": [count_connection]},
+        )
+    except ImportError:
+        logging.warning("HTTP/2 needs the 'h2' package (pip install data-test[http2]); using HTTP/1.1.")
+        return None
+    client.pool_stats = stats
+    return client
+
+
+def session_pool_stats(session: HttpSession) -> Optional[Dict[str, Any]]:
+    """Returns the pool counters of a client built by this module, or None."""
+    if isinstance(session, httpx.Client):
+        stats = getattr(session, "pool_stats", None)
+        return stats.snapshot() if stats else None
+    adapter = session.get_adapter("http://")
+    if isinstance(adapter, InstrumentedHTTPAdapter):
+        return adapter.stats.snapshot()
+    return None
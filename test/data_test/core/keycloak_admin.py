@@ -0,0 +1,161 @@
+"""
+Keycloak admin client used to provision test users.
+
+The admin token is fetched once and reused until shortly before it
+expires, and every admin call goes through one keep-alive session whose
+connection pool is sized for concurrent provisioning.
+"""
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from data_test.core.config import (
+    KEYCLOAK_ADMIN_CLIENT_ID,
+    KEYCLOAK_ADMIN_PASSWORD,
+    KEYCLOAK_ADMIN_POOL_SIZE,
+    KEYCLOAK_ADMIN_TOKEN_ENDPOINT,
+    KEYCLOAK_ADMIN_USERNAME,
+    KEYCLOAK_BASE_URL,
+    KEYCLOAK_REALM,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+)
+from data_test.core.lazy import LazySingleton
+
+
+class KeycloakAdminClient:
+    """
+    Creates and looks up Keycloak users through the admin REST API.
+    """
+
+    def __init__(self, pool_size: int = KEYCLOAK_ADMIN_POOL_SIZE):
+        """Initializes the pooled keep-alive session; the admin token is fetched lazily."""
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def admin_token(self, force: bool = False) -> Optional[str]:
+        """Returns the cached admin access token, authenticating when it is missing or expiring."""
+        with self._lock:
+            if not force and self._token and self._token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+                return self._token
+
+            payload = {
+                'grant_type': 'password',
+                'client_id': KEYCLOAK_ADMIN_CLIENT_ID,
+                'username': KEYCLOAK_ADMIN_USERNAME,
+                'password': KEYCLOAK_ADMIN_PASSWORD,
+            }
+            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+            try:
+                response = self.session.post(KEYCLOAK_ADMIN_TOKEN_ENDPOINT, data=payload, headers=headers, timeout=15)
+            except requests.exceptions.RequestException as e:
+                logging.error(f"Keycloak admin authentication request failed: {e}")
+                return None
+            if response.status_code != 200:
+                logging.error(f"Keycloak admin authentication failed: {response.status_code} {response.text}")
+                return None
+            try:
+                token_data = response.json()
+            except ValueError:
+                logging.error("Keycloak admin authentication response is not valid JSON.")
+                return None
+
+            self._token = token_data.get("access_token")
+            self._token_expires_at = time.time() + token_data.get("expires_in", 0)
+            return self._token
+
+    def _admin_request(self, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        """Sends an admin API request, re-authenticating once if the cached token was rejected."""
+        for attempt in range(2):
+            token = self.admin_token(force=attempt > 0)
+            if not token:
+                return None
+            headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+            try:
+                response = self.session.request(
+                    method, f"{KEYCLOAK_BASE_URL}/admin/realms/{path}", headers=headers, timeout=15, **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                logging.error(f"Keycloak admin request to {path} failed: {e}")
+                return None
+            if response.status_code != 401:
+                return response
+        return response
+
+    def create_user(
+        self,
+        username: str,
+        email: str,
+        first_name: str,
+        last_name: str,
+        password: str,
+        realm: str = KEYCLOAK_REALM,
+    ) -> Optional[str]:
+        """Creates a Keycloak user and returns its ID (the existing ID if the user already exists)."""
+        user_payload = {
+            "username": username,
+            "email": email,
+            "enabled": True,
+            "emailVerified": True,
+            "firstName": first_name,
+            "lastName": last_name,
+            "credentials": [
+                {"type": "password", "value": password, "temporary": False}
+            ],
+        }
+        response = self._admin_request("POST", f"{realm}/users", json=user_payload)
+        if response is None:
+            return None
+
+        if response.status_code == 201:
+            location = response.headers.get("Location", "")
+            match = re.search(r"/([^/]+)$", location)
+            return match.group(1) if match else None
+
+        if response.status_code == 409:
+            return self.find_user_id(username, realm)
+
+        logging.error(f"Keycloak create user failed: {response.status_code} {response.text}")
+        return None
+
+    def find_user_id(self, username: str, realm: str = KEYCLOAK_REALM) -> Optional[str]:
+        """Finds a Keycloak user ID by username."""
+        response = self._admin_request("GET", f"{realm}/users", params={"username": username, "exact": "true"})
+        if response is None:
+            return None
+        if response.status_code != 200:
+            logging.error(f"Keycloak lookup user failed: {response.status_code} {response.text}")
+            return None
+        try:
+            users = response.json()
+        except ValueError:
+            logging.error("Keycloak lookup user response is not valid JSON.")
+            return None
+        if not users:
+            return None
+        return users[0].get("id")
+
+    def provision_users(self, users: Iterable[Dict[str, Any]], workers: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Creates many users concurrently over the shared session.
+
+        Each item holds the keyword arguments of `create_user`; the returned
+        list holds the user IDs in the same order (None for failures).
+        """
+        with ThreadPoolExecutor(max_workers=workers or self.pool_size) as executor:
+            return list(executor.map(lambda user: self.create_user(**user), users))
+
+
+# --- Singleton Instance ---
+keycloak_admin: KeycloakAdminClient = LazySingleton(KeycloakAdminClient)
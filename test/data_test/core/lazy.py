@@ -0,0 +1,56 @@
+"""
+Module-level singletons created on first use.
+
+Every story and CLI command imports the client modules, but commands such
+as `list-stories` (and short-lived worker processes) never send a request.
+A `LazySingleton` stands in for the instance at import time and builds it
+the first time one of its attributes is read or set, so importing a module
+no longer pays for sessions, connection pools or Faker.
+"""
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """
+    Proxy that creates its instance with `factory()` on first attribute access.
+
+    Attribute reads and writes are forwarded to the instance. The proxy's own
+    names are prefixed with `_lazy_` so they cannot shadow the instance's.
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_instance", "_lazy_lock")
+
+    def __init__(self, factory: Callable[[], T]):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _lazy_get(self) -> T:
+        """Returns the instance, creating it once."""
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                instance = self._lazy_instance
+                if instance is None:
+                    instance = self._lazy_factory()
+                    object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    @property
+    def _lazy_created(self) -> bool:
+        """Whether the instance exists yet."""
+        return self._lazy_instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._lazy_get(), name, value)
+
+    def __repr__(self) -> str:
+        if self._lazy_instance is None:
+            return f"<lazy {getattr(self._lazy_factory, '__name__', 'singleton')} (not created)>"
+        return repr(self._lazy_instance)
@@ -0,0 +1,263 @@
+"""
+Request metrics collected by the API clients.
+
+Every request is timed with a monotonic clock and recorded under its route
+template (e.g. 'PATCH comandalivre/commands/{command_id}/status'), taken
+from `data_test.core.routes`, so the number of series stays bounded no
+matter how many IDs a run creates. Ad-hoc paths sent through the generic
+helpers are normalized with `route_template` instead. Latencies go
+into fixed-size log-bucketed histograms, so memory does not grow with the
+number of requests either.
+
+Each request is also recorded in a second, corrected histogram. In an
+open-loop run an iteration that starts behind its scheduled time (because
+the harness stalled, or the backend did and the arrival had to wait for an
+in-flight slot) would otherwise hide that wait: the
+corrected latency adds the iteration's start lag, read from the
+`schedule_lag` context variable, so it is measured from the intended start.
+Outside open-loop runs the lag is zero and both histograms are identical.
+
+When phase timing is on, each request can also carry a breakdown (DNS,
+TCP connect, TLS, time to first byte, body transfer) and the durations the
+backend reported in its `Server-Timing` header; each phase gets its own
+histogram under the route.
+
+The process-wide `metrics` registry can be queried at any time, during or
+after a run.
+"""
+import math
+import re
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Histogram range and resolution: 10µs to ~10min, each bucket 2% wider than
+# the previous one, which bounds the percentile error to about 2%.
+HISTOGRAM_MIN_SECONDS = 0.00001
+HISTOGRAM_GROWTH = 1.02
+HISTOGRAM_BUCKETS = 910
+
+# Seconds the current story iteration started behind its scheduled time.
+# Set by the open-loop runner; each asyncio task (and `to_thread` call) sees
+# its own value.
+schedule_lag: ContextVar[float] = ContextVar("schedule_lag", default=0.0)
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)")
+
+
+_SERVER_TIMING_DURATION = re.compile(r"(?:^|;)\s*dur=\"?([0-9.]+)")
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parses a Server-Timing header into {'server.<name>': seconds}.
+
+    Metrics without a 'dur' parameter are skipped; durations are in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+    if not header:
+        return timings
+    for metric in header.split(","):
+        name, _, params = metric.strip().partition(";")
+        match = _SERVER_TIMING_DURATION.search(params)
+        if name and match:
+            try:
+                timings[f"server.{name.strip()}"] = float(match.group(1)) / 1000
+            except ValueError:
+                continue
+    return timings
+
+
+def route_template(path: str) -> str:
+    """Replaces UUID and numeric path segments with '{id}'."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory histogram of durations in seconds.
+    """
+
+    _LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+    def __init__(self):
+        self.counts: List[int] = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Adds one duration."""
+        if seconds <= HISTOGRAM_MIN_SECONDS:
+            index = 0
+        else:
+            index = min(
+                HISTOGRAM_BUCKETS - 1,
+                math.ceil(math.log(seconds / HISTOGRAM_MIN_SECONDS) / self._LOG_GROWTH),
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        """Adds every value recorded in `other`."""
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Returns the upper bound of the bucket holding the given percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.max, HISTOGRAM_MIN_SECONDS * HISTOGRAM_GROWTH ** index)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Returns the mean, p50, p90, p99 and max, in seconds."""
+        return {
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class EndpointStats:
+    """
+    Raw and corrected latency histograms, status-code counts and resilience
+    counters (retries, requests rejected by an open circuit) of one route template.
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.corrected = LatencyHistogram()
+        self.status_codes: Dict[int, int] = {}
+        self.errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.circuit_state = "closed"
+        self.phases: Dict[str, LatencyHistogram] = {}
+
+    def record(
+        self,
+        seconds: float,
+        status_code: Optional[int],
+        corrected_seconds: float,
+        phases: Optional[Dict[str, float]] = None,
+    ):
+        self.latency.record(seconds)
+        self.corrected.record(corrected_seconds)
+        if phases:
+            for phase, duration in phases.items():
+                histogram = self.phases.get(phase)
+                if histogram is None:
+                    histogram = self.phases[phase] = LatencyHistogram()
+                histogram.record(duration)
+        if status_code is None:
+            self.errors += 1
+        else:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of `EndpointStats` keyed by 'METHOD route/template'.
+    """
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        key: str,
+        seconds: float,
+        status_code: Optional[int],
+        corrected_seconds: Optional[float] = None,
+        phases: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Records one request; `status_code` is None when no response was received.
+
+        `corrected_seconds` is the latency measured from the intended start
+        of the request and defaults to `seconds`. `phases` holds optional
+        per-phase durations ('dns', 'connect', 'tls', 'ttfb', 'body',
+        'server.<name>').
+        """
+        if corrected_seconds is None:
+            corrected_seconds = seconds
+        with self._lock:
+            self._stats(key).record(seconds, status_code, corrected_seconds, phases)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Returns one summary row per route template, sorted by route.
+
+        The raw latency summary is flattened into the row; the corrected one
+        is under 'corrected'.
+        """
+        with self._lock:
+            rows = []
+            for key, stats in sorted(self._endpoints.items()):
+                rows.append({
+                    "route": key,
+                    "count": stats.latency.count,
+                    "errors": stats.errors,
+                    "status_codes": dict(sorted(stats.status_codes.items())),
+                    **stats.latency.summary(),
+                    "corrected": stats.corrected.summary(),
+                    "retries": stats.retries,
+                    "short_circuited": stats.short_circuited,
+                    "circuit_state": stats.circuit_state,
+                    "phases": {
+                        phase: {"count": histogram.count, **histogram.summary()}
+                        for phase, histogram in sorted(stats.phases.items())
+                    },
+                })
+            return rows
+
+    def _stats(self, key: str) -> EndpointStats:
+        """Returns the stats of a route, creating them; called with the lock held."""
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def count(self, key: str, counter: str):
+        """Increments a resilience counter ('retries' or 'short_circuited') of a route."""
+        with self._lock:
+            stats = self._stats(key)
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def set_circuit_state(self, key: str, state: str):
+        """Records the current circuit breaker state of a route."""
+        with self._lock:
+            self._stats(key).circuit_state = state
+
+    def reset(self):
+        """Drops every recorded value."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+# --- Singleton Instance ---
+metrics = MetricsRegistry()
@@ -0,0 +1,122 @@
+"""
+Streaming iteration over the backend's paginated (PageDTO) endpoints.
+
+Paged endpoints take `pageNumber`/`pageSize` query parameters and answer
+with `content`, `hasNext` and `totalPages`. The iterators below walk every
+page and yield items as they arrive. While the caller consumes one page the
+next one is already being requested, so network wait overlaps processing,
+and at most two pages are held in memory however large the collection is.
+
+`iter_items` drives blocking fetch functions (ApiClient methods) and reads
+ahead on a single worker thread; `aiter_items` drives coroutine functions
+(AsyncApiClient methods) and reads ahead with an asyncio task.
+"""
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from data_test.core.config import PAGINATION_PAGE_SIZE
+from data_test.core.response import ApiResponse
+
+PageFetcher = Callable[[Dict[str, Any]], Optional[ApiResponse]]
+AsyncPageFetcher = Callable[[Dict[str, Any]], Awaitable[Optional[ApiResponse]]]
+
+
+def _page_params(params: Optional[Dict[str, Any]], page_number: int, page_size: int) -> Dict[str, Any]:
+    return {**(params or {}), "pageNumber": page_number, "pageSize": page_size}
+
+
+def _parse_page(response: Optional[ApiResponse], page_number: int) -> Tuple[List[Any], bool]:
+    """Returns the items of a page and whether another page follows."""
+    if not (response and response.status_code == 200):
+        status_code = response.status_code if response is not None else "N/A"
+        logging.error(f"Failed to fetch page {page_number}. Status: {status_code}")
+        return [], False
+    try:
+        payload = response.json()
+    except ValueError:
+        logging.error(f"Page {page_number} response is not valid JSON.")
+        return [], False
+    content = payload.get("content") or []
+    total_pages = payload.get("totalPages")
+    has_next = bool(payload.get("hasNext")) and bool(content)
+    if total_pages is not None and page_number + 1 >= total_pages:
+        has_next = False
+    return content, has_next
+
+
+def iter_pages(
+    fetch: PageFetcher,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = PAGINATION_PAGE_SIZE,
+) -> Iterator[List[Any]]:
+    """
+    Yields the content of each page returned by `fetch(params)`.
+
+    The request for page N+1 is sent before page N is yielded. A failed page
+    is logged and ends the iteration.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-read-ahead")
+    try:
+        page_number = 0
+        # The read-ahead request runs in a copy of the caller's context, so it
+        # is recorded like any other request of the current iteration.
+        future = executor.submit(contextvars.copy_context().run, fetch, _page_params(params, 0, page_size))
+        while future is not None:
+            content, has_next = _parse_page(future.result(), page_number)
+            future = None
+            if has_next:
+                page_number += 1
+                future = executor.submit(
+                    contextvars.copy_context().run, fetch, _page_params(params, page_number, page_size)
+                )
+            if content:
+                yield content
+    finally:
+        # Runs when the caller stops early too; a pending read-ahead is dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_items(
+    fetch: PageFetcher,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = PAGINATION_PAGE_SIZE,
+) -> Iterator[Any]:
+    """Yields every item of every page, see `iter_pages`."""
+    for content in iter_pages(fetch, params, page_size):
+        yield from content
+
+
+async def aiter_pages(
+    fetch: AsyncPageFetcher,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = PAGINATION_PAGE_SIZE,
+) -> AsyncIterator[List[Any]]:
+    """Async counterpart of `iter_pages` for coroutine fetch functions."""
+    page_number = 0
+    task: Optional[asyncio.Task] = asyncio.ensure_future(fetch(_page_params(params, 0, page_size)))
+    try:
+        while task is not None:
+            content, has_next = _parse_page(await task, page_number)
+            task = None
+            if has_next:
+                page_number += 1
+                task = asyncio.ensure_future(fetch(_page_params(params, page_number, page_size)))
+            if content:
+                yield content
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def aiter_items(
+    fetch: AsyncPageFetcher,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = PAGINATION_PAGE_SIZE,
+) -> AsyncIterator[Any]:
+    """Yields every item of every page, see `aiter_pages`."""
+    async for content in aiter_pages(fetch, params, page_size):
+        for item in content:
+            yield item
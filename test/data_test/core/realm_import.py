@@ -0,0 +1,105 @@
+"""
+Offline generator of Keycloak users for the 'comandalivre' realm.
+
+Creating tens of thousands of users through the admin REST API is far too
+slow, so this module writes them to a Keycloak partial-import file
+(Realm settings > Partial import, or POST /admin/realms/{realm}/partialImport)
+together with the matching user pool file read by `data_test.core.user_pool`.
+
+Users are generated and written one at a time, so memory use does not grow
+with the number of users.
+"""
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from data_test.core.data_generator import data_generator, split_name
+from data_test.core.user_pool import ROLES
+
+# pbkdf2-sha512 with a 512-bit derived key, as Keycloak stores it. The default
+# of 27500 iterations is below Keycloak's current default (210000): it keeps the
+# first login of each imported user cheap, and Keycloak rehashes the password
+# with the realm's policy on that login.
+PBKDF2_ALGORITHM = "pbkdf2-sha512"
+PBKDF2_KEY_LENGTH = 64
+
+
+def hashed_password_credential(password: str, iterations: int) -> Dict[str, Any]:
+    """
+    Builds a pre-hashed password credential, so Keycloak does not have to
+    hash one password per user while importing.
+    """
+    salt = os.urandom(16)
+    derived = hashlib.pbkdf2_hmac("sha512", password.encode("utf-8"), salt, iterations, PBKDF2_KEY_LENGTH)
+    return {
+        "type": "password",
+        "temporary": False,
+        "secretData": json.dumps({
+            "value": base64.b64encode(derived).decode("ascii"),
+            "salt": base64.b64encode(salt).decode("ascii"),
+            "additionalParameters": {},
+        }),
+        "credentialData": json.dumps({
+            "hashIterations": iterations,
+            "algorithm": PBKDF2_ALGORITHM,
+            "additionalParameters": {},
+        }),
+    }
+
+
+def _realm_user(credentials: Dict[str, str], password_credential: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Maps pool credentials to a Keycloak user representation."""
+    name_parts = split_name(credentials["name"])
+    return {
+        "username": credentials["username"],
+        "email": credentials["email"],
+        "enabled": True,
+        "emailVerified": True,
+        "firstName": name_parts["first_name"],
+        "lastName": name_parts["last_name"],
+        "credentials": [
+            password_credential
+            or {"type": "password", "value": credentials["password"], "temporary": False}
+        ],
+    }
+
+
+def write_realm_import(
+    count: int,
+    output: Path,
+    pool_file: Path,
+    shared_password: Optional[str] = None,
+    hash_iterations: int = 27500,
+) -> int:
+    """
+    Streams `count` users per role to `output` and their credentials to `pool_file`.
+
+    With `shared_password` every user gets the same password, hashed once and
+    reused, which keeps both the generation and the Keycloak import fast.
+    Otherwise each user gets its own plain-text password and Keycloak hashes
+    it during the import. Returns the number of users written.
+    """
+    password_credential = None
+    if shared_password:
+        password_credential = hashed_password_credential(shared_password, hash_iterations)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    pool_file.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with output.open("w", encoding="utf-8") as realm_out, pool_file.open("w", encoding="utf-8") as pool_out:
+        realm_out.write('{"ifResourceExists": "SKIP", "users": [\n')
+        for role in ROLES:
+            for _ in range(count):
+                credentials = data_generator.generate_pool_user(role)
+                if shared_password:
+                    credentials["password"] = shared_password
+                if written:
+                    realm_out.write(",\n")
+                realm_out.write(json.dumps(_realm_user(credentials, password_credential), ensure_ascii=False))
+                pool_out.write(json.dumps(credentials, ensure_ascii=False) + "\n")
+                written += 1
+        realm_out.write("\n]}\n")
+    return written
@@ -0,0 +1,97 @@
+"""
+Client-side cache of reference data.
+
+Product categories, role types and company types almost never change, yet
+every onboarding iteration asks for them again. Routes registered with
+`reference=True` are served from this cache: successful responses are kept
+for REFERENCE_CACHE_TTL_SECONDS, in an LRU of at most
+REFERENCE_CACHE_MAX_ENTRIES entries, shared by every client, virtual user
+and iteration of the process.
+
+Disable it (REFERENCE_CACHE_ENABLED=false or `run --no-reference-cache`) to
+benchmark the reference endpoints themselves.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from data_test.core.config import REFERENCE_CACHE_ENABLED, REFERENCE_CACHE_MAX_ENTRIES, REFERENCE_CACHE_TTL_SECONDS
+from data_test.core.response import ApiResponse
+from data_test.core.routes import Route
+
+CacheKey = Tuple[str, str, Hashable]
+
+
+class ReferenceCache:
+    """
+    Thread-safe TTL + LRU cache of reference-data responses.
+    """
+
+    def __init__(
+        self,
+        ttl: float = REFERENCE_CACHE_TTL_SECONDS,
+        max_entries: int = REFERENCE_CACHE_MAX_ENTRIES,
+        enabled: bool = REFERENCE_CACHE_ENABLED,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[CacheKey, Tuple[float, ApiResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, route: Route, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[CacheKey]:
+        """Returns the cache key of a request, or None when it must not be cached."""
+        if not (self.enabled and route.reference):
+            return None
+        return route.key, endpoint, tuple(sorted(params.items())) if params else None
+
+    def get(self, key: CacheKey) -> Optional[ApiResponse]:
+        """Returns a fresh cached response, counting the hit or miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, response: Optional[ApiResponse]):
+        """Caches a successful response, evicting the least recently used entry when full."""
+        if not (response is not None and response.status_code == 200):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, route: Optional[Route] = None):
+        """Drops the cached responses of one route, or of every route."""
+        with self._lock:
+            if route is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == route.key]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# --- Singleton Instance ---
+reference_cache = ReferenceCache()
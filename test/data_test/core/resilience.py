@@ -0,0 +1,173 @@
+"""
+Retry policy and per-route circuit breakers used by the API clients.
+
+During a backend brownout, failing fast everywhere stops a run, while
+retrying everything multiplies the load on a service that is already
+struggling. Both mechanisms are off by default, so functional runs see every
+failure as it happens; when enabled (RETRY_MAX_ATTEMPTS > 1,
+CIRCUIT_BREAKER_FAILURES > 0) the clients:
+
+- retry only idempotent requests (GET, PUT, DELETE, ...) that failed to
+  connect or got 429/502/503/504, after a full-jitter exponential backoff,
+  and only while the retry budget allows it: retries may add at most
+  RETRY_BUDGET_RATIO extra requests on top of the normal traffic;
+- stop sending to a route template after CIRCUIT_BREAKER_FAILURES consecutive
+  failures (no response or 5xx). The circuit stays open for
+  CIRCUIT_BREAKER_RESET_SECONDS, then one probe request decides whether it
+  closes again. Requests rejected by an open circuit return None right
+  away, without reaching the backend. An attempt that raises anything other
+  than a transport error counts as a failure, so a probe always settles the
+  circuit.
+
+Retries, rejected requests and circuit states are recorded per route in
+`data_test.core.metrics`.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from data_test.core.config import (
+    CIRCUIT_BREAKER_FAILURES,
+    CIRCUIT_BREAKER_RESET_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_BUDGET_RATIO,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+from data_test.core.metrics import metrics
+from data_test.core.routes import IDEMPOTENT_METHODS
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Most retries that can be banked; also the budget at start, so a short run
+# can still ride out an isolated failure.
+RETRY_BUDGET_MAX = 10.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed attempt is retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY_SECONDS,
+        max_delay: float = RETRY_MAX_DELAY_SECONDS,
+        budget_ratio: float = RETRY_BUDGET_RATIO,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self._budget = RETRY_BUDGET_MAX
+        self._lock = threading.Lock()
+
+    def on_request(self):
+        """Earns retry budget for one new (non-retry) request."""
+        with self._lock:
+            self._budget = min(self._budget + self.budget_ratio, RETRY_BUDGET_MAX)
+
+    def backoff(self, method: str, attempt: int, status_code: Optional[int]) -> Optional[float]:
+        """
+        Returns the delay before retrying, or None when the attempt must not be retried.
+
+        `attempt` counts from 1; `status_code` is None when no response was received.
+        """
+        if attempt >= self.max_attempts or method not in IDEMPOTENT_METHODS:
+            return None
+        if status_code is not None and status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        with self._lock:
+            if self._budget < 1:
+                return None
+            self._budget -= 1
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker of one route template.
+    """
+
+    def __init__(self, key: str, failure_threshold: int, reset_timeout: float):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        """Changes state; called with the lock held."""
+        if state != self.state:
+            level = logging.WARNING if state == OPEN else logging.INFO
+            logging.log(level, f"Circuit for '{self.key}' is now {state}.")
+            self.state = state
+            metrics.set_circuit_state(self.key, state)
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Let exactly one probe through.
+                self._set_state(HALF_OPEN)
+                return True
+            return False
+
+    def record(self, failed: bool):
+        """Updates the state with the outcome of a request."""
+        with self._lock:
+            if not failed:
+                self._failures = 0
+                self._set_state(CLOSED)
+                return
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers keyed by route template, created on first use.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURES,
+        reset_timeout: float = CIRCUIT_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CircuitBreaker]:
+        """Returns the breaker of a route, or None when circuit breaking is disabled."""
+        if self.failure_threshold <= 0:
+            return None
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(key, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+
+def is_failure(status_code: Optional[int]) -> bool:
+    """A request counts against the circuit when it got no response or a 5xx."""
+    return status_code is None or status_code >= 500
+
+
+# --- Singleton Instances ---
+retry_policy = RetryPolicy()
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,82 @@
+"""
+Response wrapper returned by the API clients.
+
+Stories inspect the same response several times (status check, ID
+extraction, payload fields), and both `requests` and `httpx` decode the body
+again on every `.json()` call. `ApiResponse` decodes it at most once, on
+first use, with orjson when it is installed (`pip install data-test[fast]`)
+and the standard library otherwise.
+"""
+import json
+from typing import Any, Union
+
+import httpx
+import requests
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+_UNSET = object()
+
+
+class ApiResponse:
+    """
+    Lightweight view of a `requests` or `httpx` response with a cached `.json()`.
+
+    Any attribute not defined here is read from the underlying response.
+    Truthiness follows `requests`: a response is truthy when its status code
+    is below 400, whichever HTTP library produced it.
+    """
+
+    __slots__ = ("raw", "_json")
+
+    def __init__(self, raw: Union[requests.Response, httpx.Response]):
+        self.raw = raw
+        self._json: Any = _UNSET
+
+    @property
+    def status_code(self) -> int:
+        return self.raw.status_code
+
+    @property
+    def headers(self):
+        return self.raw.headers
+
+    @property
+    def content(self) -> bytes:
+        return self.raw.content
+
+    @property
+    def text(self) -> str:
+        return self.raw.text
+
+    @property
+    def ok(self) -> bool:
+        return self.raw.status_code < 400
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def json(self) -> Any:
+        """
+        Returns the decoded body, decoding it on the first call only.
+
+        Raises ValueError when the body is not valid JSON, like `requests`.
+        """
+        if self._json is _UNSET:
+            try:
+                self._json = _loads(self.raw.content)
+            except ValueError as e:
+                self._json = e
+        if isinstance(self._json, ValueError):
+            raise self._json
+        return self._json
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def __repr__(self) -> str:
+        return f"<ApiResponse [{self.status_code}]>"
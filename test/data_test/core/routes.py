@@ -0,0 +1,95 @@
+"""
+Registry of the ComandaLivre API routes used by the clients.
+
+Each endpoint method of `BaseApiClient` declares its route here once: the
+operation name, the HTTP method and the path template. Metrics and reports
+aggregate by `Route.key` (e.g. 'GET comandalivre/orders/{order_id}'), which
+is computed once per route, so the request hot path never has to normalize
+concrete URLs and the number of series stays bounded.
+"""
+from dataclasses import dataclass, field
+from typing import Dict
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    An API operation and its path template, relative to API_BASE_URL.
+
+    `reference` marks near-static reference data that the clients may serve
+    from `data_test.core.reference_cache`.
+    """
+    operation: str
+    method: str
+    template: str
+    reference: bool = False
+    key: str = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "key", f"{self.method} {self.template}")
+
+    @property
+    def idempotent(self) -> bool:
+        return self.method in IDEMPOTENT_METHODS
+
+    def path(self, **path_params) -> str:
+        """Fills the template with concrete path parameters."""
+        return self.template.format(**path_params) if path_params else self.template
+
+
+ROUTES: Dict[str, Route] = {}
+
+
+def register(operation: str, method: str, template: str, reference: bool = False) -> Route:
+    """Declares a route; operation names are unique."""
+    if operation in ROUTES:
+        raise ValueError(f"Route '{operation}' is already registered.")
+    route = ROUTES[operation] = Route(operation, method, template, reference)
+    return route
+
+
+# --- Company Service ---
+GET_PUBLIC_COMPANIES = register("get_public_companies", "GET", "company/companies")
+GET_PUBLIC_COMPANY_BY_ID = register("get_public_company_by_id", "GET", "company/companies/{company_id}")
+CREATE_COMPANY = register("create_company", "POST", "company/companies")
+GET_COMPANY_TYPE_BY_ENUM = register("get_company_type_by_enum", "GET", "company/company-types/by-enum/{enum_name}", reference=True)
+GET_ROLE_TYPE_BY_ENUM = register("get_role_type_by_enum", "GET", "company/role-types/by-enum/{enum_name}", reference=True)
+GET_ROLE_TYPES_LIST = register("get_role_types_list", "GET", "company/role-types/list", reference=True)
+INVITE_EMPLOYEE = register("invite_employee", "POST", "company/employees/invites")
+ACCEPT_EMPLOYEE_INVITE = register("accept_employee_invite", "PATCH", "company/employees/invites/{invite_id}/accept")
+GET_EMPLOYEES_FOR_COMPANY = register("get_employees_for_company", "GET", "company/employees/by-company/{company_id}")
+GET_EMPLOYEE_INVITES_BY_COMPANY = register("get_employee_invites_by_company", "GET", "company/employees/invites/company/{company_id}")
+GET_MY_EMPLOYEE_INVITES = register("get_my_employee_invites", "GET", "company/employees/invites/")
+
+# --- ComandaLivre Service ---
+GET_PUBLIC_PRODUCTS = register("get_public_products", "GET", "comandalivre/products")
+GET_PUBLIC_PRODUCT_BY_ID = register("get_public_product_by_id", "GET", "comandalivre/products/{product_id}")
+GET_PRODUCT_CATEGORIES = register("get_product_categories", "GET", "comandalivre/product-categories/list", reference=True)
+CREATE_PRODUCT = register("create_product", "POST", "comandalivre/products")
+UPDATE_PRODUCT = register("update_product", "PUT", "comandalivre/products/{product_id}")
+UPDATE_PRODUCT_STATUS = register("update_product_status", "PATCH", "comandalivre/products/{product_id}/status/{status}")
+DELETE_PRODUCT = register("delete_product", "DELETE", "comandalivre/products/{product_id}")
+CREATE_TABLE = register("create_table", "POST", "comandalivre/tables")
+CREATE_TABLES_BULK = register("create_tables_bulk", "POST", "comandalivre/tables/bulk")
+GET_TABLES = register("get_tables", "GET", "comandalivre/tables")
+GET_TABLES_LIST = register("get_tables_list", "GET", "comandalivre/tables/list")
+GET_TABLE_BY_ID = register("get_table_by_id", "GET", "comandalivre/tables/{table_id}")
+UPDATE_TABLE = register("update_table", "PUT", "comandalivre/tables/{table_id}")
+DELETE_TABLE = register("delete_table", "DELETE", "comandalivre/tables/{table_id}")
+CREATE_COMMAND = register("create_command", "POST", "comandalivre/commands")
+GET_COMMAND_BY_ID = register("get_command_by_id", "GET", "comandalivre/commands/{command_id}")
+UPDATE_COMMAND_STATUS = register("update_command_status", "PATCH", "comandalivre/commands/{command_id}/status")
+CHANGE_COMMAND_TABLE = register("change_command_table", "PATCH", "comandalivre/commands/{command_id}/change-table")
+GET_COMMANDS_COUNT = register("get_commands_count", "GET", "comandalivre/commands/count")
+GET_COMMAND_BILL_DATA = register("get_command_bill_data", "GET", "comandalivre/commands/{command_id}/bill-data")
+ADD_ORDER_TO_COMMAND = register("add_order_to_command", "POST", "comandalivre/orders")
+GET_ORDERS = register("get_orders", "GET", "comandalivre/orders")
+GET_ORDER_BY_ID = register("get_order_by_id", "GET", "comandalivre/orders/{order_id}")
+UPDATE_ORDER_STATUS = register("update_order_status", "PATCH", "comandalivre/orders/{order_id}/status")
+DELETE_ORDER = register("delete_order", "DELETE", "comandalivre/orders/{order_id}")
+IS_COMMAND_FULLY_CLOSED = register("is_command_fully_closed", "GET", "comandalivre/orders/is-command-fully-closed")
+
+# --- Shared / Users ---
+AUTH = register("auth", "POST", "shared/users/auth")
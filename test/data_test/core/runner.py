@@ -0,0 +1,212 @@
+"""
+Concurrent story runner.
+
+Drives story iterations as asyncio coroutines so a single process can keep
+many virtual users (and their requests) in flight at the same time.
+
+A story module takes part in the async mode by defining
+`async def run_story_async(client: AsyncApiClient)`. Stories that only
+define the blocking `run_story()` still work: they are run on a worker
+thread, one per virtual user.
+
+Two load models are available. `run_concurrent` is closed-loop: each
+virtual user starts its next iteration when the previous one finishes, so
+throughput drops when the backend slows down. `run_open_loop` starts
+iterations on a fixed arrival schedule instead, independent of how long
+earlier iterations take, and reports the starts it could not honour. The
+schedule can follow a time-of-day arrival curve (see
+`data_test.core.distributions`), e.g. lunch and dinner peaks. Its
+start lag is passed on to the metrics so latency can also be reported from
+the intended start of each iteration (see `data_test.core.metrics`).
+
+Each iteration runs in the data generator stream of its index (see
+`DataGeneratorProxy.stream`), so with a run seed iteration N builds the same
+payloads whichever virtual user happens to run it.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import ModuleType
+from typing import List, Optional, Set
+
+from data_test.core.api_client import AsyncApiClient
+from data_test.core.config import ASYNC_MAX_CONNECTIONS
+from data_test.core.data_generator import data_generator
+from data_test.core.distributions import SECONDS_PER_DAY, ArrivalCurve, arrival_offsets
+from data_test.core.hedging import HedgingPolicy
+from data_test.core.metrics import metrics, schedule_lag
+
+# An open-loop start later than this past its scheduled time counts as late.
+LATE_START_TOLERANCE_SECONDS = 0.01
+# Metrics key under which dropped open-loop arrivals are recorded.
+DROPPED_ARRIVAL_KEY = "DROPPED open-loop arrival"
+
+
+@dataclass
+class RunSummary:
+    """Outcome of a concurrent run."""
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    # Open-loop runs only: arrivals due, arrivals that waited for a slot
+    # because the in-flight limit was reached, arrivals skipped because the
+    # queue was full too, and starts behind schedule.
+    scheduled: int = 0
+    queued: int = 0
+    dropped: int = 0
+    late: int = 0
+    max_start_lag: float = 0.0
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def run_iteration(story_module: ModuleType, client: AsyncApiClient):
+    """Runs a single story iteration, natively async when the story supports it."""
+    run_story_async = getattr(story_module, "run_story_async", None)
+    if run_story_async is not None:
+        await run_story_async(client)
+    else:
+        await asyncio.to_thread(story_module.run_story)
+
+
+async def _run_counted(story_module: ModuleType, client: AsyncApiClient, summary: RunSummary, index: int):
+    """Runs iteration number `index` and counts its outcome in `summary`."""
+    summary.started += 1
+    try:
+        with data_generator.stream(f"i{index}"):
+            await run_iteration(story_module, client)
+        summary.completed += 1
+    except Exception as e:
+        summary.failed += 1
+        logging.exception(f"Story iteration failed: {e}")
+
+
+async def run_concurrent(
+    story_module: ModuleType,
+    concurrency: int,
+    iterations: Optional[int] = None,
+    hedging: Optional[HedgingPolicy] = None,
+    phase_timing: bool = False,
+) -> RunSummary:
+    """
+    Runs `iterations` story iterations spread over `concurrency` virtual users.
+
+    With `iterations=None` the run continues until it is cancelled (Ctrl+C);
+    the summary of what ran so far is still returned. `hedging` and
+    `phase_timing` are passed to the shared `AsyncApiClient`.
+    """
+    summary = RunSummary()
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    async def virtual_user(client: AsyncApiClient):
+        while iterations is None or summary.started < iterations:
+            await _run_counted(story_module, client, summary, summary.started)
+
+    start = time.monotonic()
+    pool_size = max(concurrency, ASYNC_MAX_CONNECTIONS)
+    async with AsyncApiClient(
+        max_connections=pool_size, max_keepalive_connections=pool_size, hedging=hedging, phase_timing=phase_timing
+    ) as client:
+        try:
+            await asyncio.gather(*(virtual_user(client) for _ in range(concurrency)))
+        except asyncio.CancelledError:
+            logging.info("Concurrent run cancelled.")
+        finally:
+            summary.elapsed = time.monotonic() - start
+    return summary
+
+
+async def run_open_loop(
+    story_module: ModuleType,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+    curve: Optional[ArrivalCurve] = None,
+    day_length: float = SECONDS_PER_DAY,
+    start_hour: float = 0.0,
+    max_queued: int = 100,
+    hedging: Optional[HedgingPolicy] = None,
+    phase_timing: bool = False,
+) -> RunSummary:
+    """
+    Starts `rate` story iterations per second for `duration` seconds.
+
+    Start times are fixed in advance (one every 1/rate seconds from the
+    beginning of the run, or following `curve` over a simulated day of
+    `day_length` seconds starting at `start_hour`; see `arrival_offsets`),
+    so a slow backend cannot slow down the arrival rate. When `max_in_flight`
+    iterations are already running, the arrival waits for a free slot; its
+    start lag includes that wait, so when the backend stalls the corrected
+    latency still grows with the backlog. At most `max_queued` arrivals wait
+    at once, which bounds memory and the drain after the schedule ends;
+    further arrivals are dropped and recorded under `DROPPED_ARRIVAL_KEY`
+    with a corrected latency from their scheduled start to the end of the
+    run, a lower bound of what they would have waited.
+    Iterations still running or queued when the schedule ends are awaited;
+    Ctrl+C cancels them. `hedging` and `phase_timing` are passed to the
+    shared `AsyncApiClient`.
+    """
+    summary = RunSummary()
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max_in_flight))
+    slots = asyncio.Semaphore(max_in_flight)
+    in_flight: Set[asyncio.Task] = set()
+    dropped: List[float] = []
+
+    async def scheduled_iteration(intended: float, index: int):
+        # Tasks start in arrival order, so a locked semaphore here means
+        # this arrival has to wait behind the running iterations.
+        if slots.locked():
+            summary.queued += 1
+        async with slots:
+            # Measured when the iteration actually starts, so event-loop
+            # stalls and the wait for an in-flight slot both count.
+            lag = max(0.0, loop.time() - intended)
+            if lag > LATE_START_TOLERANCE_SECONDS:
+                summary.late += 1
+            summary.max_start_lag = max(summary.max_start_lag, lag)
+            # Each task runs in its own context, so this only affects the
+            # requests of this iteration.
+            schedule_lag.set(lag)
+            await _run_counted(story_module, client, summary, index)
+
+    start = loop.time()
+    pool_size = max(max_in_flight, ASYNC_MAX_CONNECTIONS)
+    async with AsyncApiClient(
+        max_connections=pool_size, max_keepalive_connections=pool_size, hedging=hedging, phase_timing=phase_timing
+    ) as client:
+        try:
+            for offset in arrival_offsets(rate, duration, curve, day_length, start_hour):
+                intended = start + offset
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                summary.scheduled += 1
+                # Tasks that have not finished are running or waiting for a slot.
+                if len(in_flight) >= max_in_flight + max_queued:
+                    summary.dropped += 1
+                    dropped.append(intended)
+                    continue
+                task = asyncio.create_task(scheduled_iteration(intended, summary.scheduled - 1))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                logging.info(f"Arrival schedule finished; waiting for {len(in_flight)} in-flight iteration(s).")
+                await asyncio.gather(*in_flight)
+        except asyncio.CancelledError:
+            logging.info("Open-loop run cancelled.")
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        finally:
+            end = loop.time()
+            summary.elapsed = end - start
+            for intended in dropped:
+                metrics.record(DROPPED_ARRIVAL_KEY, end - intended, None, end - intended)
+    return summary
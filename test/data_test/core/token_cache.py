@@ -0,0 +1,139 @@
+"""
+Keycloak token cache.
+
+Stories authenticate the same users many times per iteration. This module
+keeps one token pair per username and only goes back to Keycloak when the
+access token is about to expire, using the refresh_token grant when the
+refresh token is still valid and the password grant otherwise.
+
+The module-level `token_cache` lives for the whole process, so under
+`run --loop` it is shared across iterations.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from data_test.core.api_client import ApiClient, api_client
+from data_test.core.config import TOKEN_REFRESH_MARGIN_SECONDS
+
+
+@dataclass
+class CachedToken:
+    """A token pair and the moments (epoch seconds) at which each part expires."""
+    access_token: str
+    expires_at: float
+    refresh_token: Optional[str] = None
+    refresh_expires_at: float = 0.0
+
+
+def _expiry(token: Optional[str], expires_in: Optional[int], now: float) -> float:
+    """Reads 'exp' from a JWT, falling back to the 'expires_in' of the token response."""
+    # Imported here: PyJWT pulls in cryptography, which CLI startup does not need.
+    import jwt
+
+    if token:
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+            if "exp" in claims:
+                return float(claims["exp"])
+        except jwt.PyJWTError:
+            pass
+    return now + (expires_in or 0)
+
+
+class TokenCache:
+    """
+    Access tokens keyed by username, renewed shortly before they expire.
+    """
+
+    def __init__(self, client: ApiClient, refresh_margin: float = TOKEN_REFRESH_MARGIN_SECONDS):
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, CachedToken] = {}
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _user_lock(self, username: str) -> threading.Lock:
+        with self._lock:
+            return self._user_locks.setdefault(username, threading.Lock())
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_token(self, username: str, password: str) -> Optional[str]:
+        """
+        Returns a valid access token for `username`, authenticating only when needed.
+        """
+        # One lock per user: concurrent callers for the same user wait for a
+        # single round trip instead of all hitting Keycloak at once.
+        with self._user_lock(username):
+            now = time.time()
+            cached = self._tokens.get(username)
+            if cached and cached.expires_at - self.refresh_margin > now:
+                self._count("hits")
+                return cached.access_token
+
+            token = None
+            if cached and cached.refresh_token and cached.refresh_expires_at - self.refresh_margin > now:
+                token = self._store(username, self.client.refresh_keycloak_token(cached.refresh_token))
+                if token:
+                    self._count("refreshes")
+            if token is None:
+                self._count("misses")
+                token = self._store(username, self.client.authenticate_with_keycloak(username, password))
+            return token
+
+    def _store(self, username: str, response) -> Optional[str]:
+        """Caches the token pair of a successful token response and returns the access token."""
+        if not (response and response.status_code == 200):
+            status_code = response.status_code if response is not None else "N/A"
+            logging.error(f"Keycloak token request for '{username}' failed. Status: {status_code}")
+            return None
+        try:
+            payload = response.json()
+        except ValueError:
+            logging.error("Keycloak token response is not valid JSON.")
+            return None
+        access_token = payload.get("access_token")
+        if not access_token:
+            return None
+
+        now = time.time()
+        refresh_token = payload.get("refresh_token")
+        self._tokens[username] = CachedToken(
+            access_token=access_token,
+            expires_at=_expiry(access_token, payload.get("expires_in"), now),
+            refresh_token=refresh_token,
+            refresh_expires_at=_expiry(refresh_token, payload.get("refresh_expires_in"), now),
+        )
+        return access_token
+
+    def invalidate(self, username: Optional[str] = None):
+        """Drops the cached token of one user, or of every user."""
+        with self._lock:
+            if username is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(username, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss/refresh counters."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.refreshes
+            return {
+                "users": len(self._tokens),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# --- Singleton Instance ---
+token_cache = TokenCache(api_client)
@@ -0,0 +1,86 @@
+"""
+Pool of pre-provisioned Keycloak test users.
+
+`users provision` creates owner and waiter users once and appends their
+credentials to USER_POOL_FILE (one JSON object per line, with a 'role'
+field). Stories lease credentials from the pool instead of creating new
+Keycloak users on every iteration. A leased user is handed to a single
+story at a time until it is released, so concurrent virtual users never
+share an identity within the process.
+"""
+import json
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Optional
+
+from data_test.core.config import USER_POOL_FILE
+
+ROLES = ("owner", "waiter")
+
+
+class UserPool:
+    """
+    Credentials grouped by role, loaded lazily from a JSONL file.
+    """
+
+    def __init__(self, path: Path = USER_POOL_FILE):
+        self.path = path
+        self._free: Dict[str, Deque[Dict[str, str]]] = {role: deque() for role in ROLES}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Reads the pool file once; called with the lock held."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            logging.info(f"No user pool at {self.path}; stories will create their own users.")
+            return
+        with self.path.open(encoding="utf-8") as pool_file:
+            for line in pool_file:
+                if line.strip():
+                    credentials = json.loads(line)
+                    self._free.setdefault(credentials["role"], deque()).append(credentials)
+        logging.info(f"Loaded user pool from {self.path}: {self._sizes()}")
+
+    def lease(self, role: str) -> Optional[Dict[str, str]]:
+        """Takes exclusive use of a user with `role`, or returns None when none is free."""
+        with self._lock:
+            self._load()
+            free = self._free.get(role)
+            # LIFO: the most recently released user is reused first, so its
+            # cached Keycloak token is still warm.
+            return free.pop() if free else None
+
+    def release(self, credentials: Dict[str, str]):
+        """Returns a leased user to the pool."""
+        with self._lock:
+            self._free.setdefault(credentials["role"], deque()).append(credentials)
+
+    def append(self, credentials: Iterable[Dict[str, str]]) -> int:
+        """Persists new credentials to the pool file and makes them available for lease."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with self._lock, self.path.open("a", encoding="utf-8") as pool_file:
+            for item in credentials:
+                pool_file.write(json.dumps(item, ensure_ascii=False) + "\n")
+                if self._loaded:
+                    self._free.setdefault(item["role"], deque()).append(item)
+                count += 1
+        return count
+
+    def sizes(self) -> Dict[str, int]:
+        """Returns the number of free users per role."""
+        with self._lock:
+            self._load()
+            return self._sizes()
+
+    def _sizes(self) -> Dict[str, int]:
+        return {role: len(free) for role, free in self._free.items()}
+
+
+# --- Singleton Instance ---
+user_pool = UserPool()
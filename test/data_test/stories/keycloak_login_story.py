@@ -41,8 +41,7 @@ def run_story():
                 # Display a snippet of the token for verification
                 console.print(f"      [dim]Bearer Token Snippet:[/] {access_token}")
 
-                api_client.set_token(access_token)
-                api_client.auth()
+                api_client.for_token(access_token).auth()
 
                 # Pretty-print the decoded token claims (header.payload.signature)
                 try:
@@ -17,7 +17,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from data_test.core.api_client import api_client
+from data_test.core.api_client import AsyncApiClient, api_client
 
 console = Console()
 
@@ -39,19 +39,44 @@ class PublicRoutesStory:
     def run(self):
         """Executes all steps of the story in sequence."""
         console.print(Panel("[bold cyan]Executing Story: Public Routes Chained Logic[/bold cyan]", expand=False))
-        
-        self._test_get_companies()
-        self._test_get_company_by_id()
-        self._test_get_products_for_company()
-        self._test_get_product_by_id()
-        
+
+        self._handle_companies(api_client.get_public_companies(params={"page": 0, "size": 1}))
+        if self._can_run("GET /company/companies/{id}", self.company_id, "company"):
+            self._handle_company_by_id(api_client.get_public_company_by_id(self.company_id))
+        if self._can_run("GET /comandalivre/products?companyId={id}", self.company_id, "company"):
+            self._handle_products_for_company(api_client.get_public_products(self.company_id))
+        if self._can_run("GET /comandalivre/products/{id}", self.product_id, "product"):
+            self._handle_product_by_id(api_client.get_public_product_by_id(self.product_id))
+
+        self._print_summary()
+
+    async def run_async(self, client: AsyncApiClient):
+        """Executes the same steps as `run`, awaiting each request on the async client."""
+        console.print(Panel("[bold cyan]Executing Story: Public Routes Chained Logic[/bold cyan]", expand=False))
+
+        self._handle_companies(await client.get_public_companies(params={"page": 0, "size": 1}))
+        if self._can_run("GET /company/companies/{id}", self.company_id, "company"):
+            self._handle_company_by_id(await client.get_public_company_by_id(self.company_id))
+        if self._can_run("GET /comandalivre/products?companyId={id}", self.company_id, "company"):
+            self._handle_products_for_company(await client.get_public_products(self.company_id))
+        if self._can_run("GET /comandalivre/products/{id}", self.product_id, "product"):
+            self._handle_product_by_id(await client.get_public_product_by_id(self.product_id))
+
         self._print_summary()
 
-    def _test_get_companies(self):
+    def _can_run(self, endpoint: str, required_id: Optional[str], id_name: str) -> bool:
+        """Records a skipped step when the ID it depends on is not available."""
+        if required_id:
+            logging.info(f"Executing: {endpoint} with {id_name} ID {required_id}")
+            return True
+        logging.warning(f"SKIPPED: {endpoint} because no {id_name} ID is available.")
+        self.results.append(TestResult(endpoint, "[yellow]Skipped[/]"))
+        return False
+
+    def _handle_companies(self, response):
         """Step 1: Fetch public companies."""
         endpoint = "GET /company/companies"
         logging.info(f"Executing: {endpoint}")
-        response = api_client.get_public_companies(params={"page": 0, "size": 1})
         
         if response and response.status_code == 200:
             try:
@@ -75,16 +100,9 @@ class PublicRoutesStory:
             logging.error(f"FAILURE: {endpoint} failed with status {status_code}.")
             self.results.append(TestResult(endpoint, "[bold red]Failure[/]", status_code))
 
-    def _test_get_company_by_id(self):
+    def _handle_company_by_id(self, response):
         """Step 2: Fetch a single company if an ID was found."""
         endpoint = "GET /company/companies/{id}"
-        if not self.company_id:
-            logging.warning(f"SKIPPED: {endpoint} because no company ID is available.")
-            self.results.append(TestResult(endpoint, "[yellow]Skipped[/]"))
-            return
-
-        logging.info(f"Executing: {endpoint} with ID {self.company_id}")
-        response = api_client.get_public_company_by_id(self.company_id)
         
         if response and response.status_code == 200:
             logging.info(f"SUCCESS: {endpoint} returned 200.")
@@ -94,16 +112,9 @@ class PublicRoutesStory:
             logging.error(f"FAILURE: {endpoint} failed with status {status_code}.")
             self.results.append(TestResult(endpoint, "[bold red]Failure[/]", status_code))
 
-    def _test_get_products_for_company(self):
+    def _handle_products_for_company(self, response):
         """Step 3: Fetch products for the company if an ID is available."""
         endpoint = "GET /comandalivre/products?companyId={id}"
-        if not self.company_id:
-            logging.warning(f"SKIPPED: {endpoint} because no company ID is available.")
-            self.results.append(TestResult(endpoint, "[yellow]Skipped[/]"))
-            return
-
-        logging.info(f"Executing: {endpoint} with company ID {self.company_id}")
-        response = api_client.get_public_products(self.company_id)
 
         if response and response.status_code == 200:
             try:
@@ -127,16 +138,9 @@ class PublicRoutesStory:
             logging.error(f"FAILURE: {endpoint} failed with status {status_code}.")
             self.results.append(TestResult(endpoint, "[bold red]Failure[/]", status_code))
             
-    def _test_get_product_by_id(self):
+    def _handle_product_by_id(self, response):
         """Step 4: Fetch a single product if an ID was found."""
         endpoint = "GET /comandalivre/products/{id}"
-        if not self.product_id:
-            logging.warning(f"SKIPPED: {endpoint} because no product ID is available.")
-            self.results.append(TestResult(endpoint, "[yellow]Skipped[/]"))
-            return
-
-        logging.info(f"Executing: {endpoint} with ID {self.product_id}")
-        response = api_client.get_public_product_by_id(self.product_id)
         
         if response and response.status_code == 200:
             logging.info(f"SUCCESS: {endpoint} returned 200.")
@@ -163,4 +167,12 @@ def run_story():
     Entry point for the story, called by the CLI.
     """
     story = PublicRoutesStory()
-    story.run()
\ No newline at end of file
+    story.run()
+
+
+async def run_story_async(client: AsyncApiClient):
+    """
+    Async entry point, used by the CLI when running with --concurrency.
+    """
+    story = PublicRoutesStory()
+    await story.run_async(client)
\ No newline at end of file